@@ -100,8 +100,9 @@ def construct_nominal_fgraph(
 
     dummy_inputs = [inp.type() for inp in inputs]
     dummy_implicit_shared_inputs = []
+    inputs_set = set(inputs)
     for var in graph_inputs(outputs, inputs):
-        if var in inputs:
+        if var in inputs_set:
             continue
         if isinstance(var, SharedVariable):
             # We allow shared inputs to be added automatically to the graph
@@ -18,6 +18,7 @@ from typing import (
     Union,
     cast,
 )
+from weakref import WeakValueDictionary
 
 import numpy as np
 
@@ -86,6 +87,8 @@ class Node(MetaObject):
 
     """
 
+    __slots__ = ()
+
     name: str | None
 
     def get_parents(self):
@@ -145,6 +148,8 @@ class Apply(Node, Generic[OpType]):
 
     """
 
+    __slots__ = ("__weakref__", "_tag", "inputs", "op", "outputs")
+
     def __init__(
         self,
         op: OpType,
@@ -158,43 +163,57 @@ class Apply(Node, Generic[OpType]):
             raise TypeError("The output of an Apply must be a sequence type")
 
         self.op = op
-        self.inputs: list[Variable] = []
-        self.tag = Scratchpad()
+        # The tag is only created when first accessed, as most nodes never use it
+        self._tag: Scratchpad | None = None
 
         # filter inputs to make sure each element is a Variable
-        for input in inputs:
-            if isinstance(input, Variable):
-                self.inputs.append(input)
-            else:
+        self.inputs: list[Variable] = list(inputs)
+        for input in self.inputs:
+            if not isinstance(input, Variable):
                 raise TypeError(
                     f"The 'inputs' argument to Apply must contain Variable instances, not {input}"
                 )
-        self.outputs: list[Variable] = []
         # filter outputs to make sure each element is a Variable
-        for i, output in enumerate(outputs):
-            if isinstance(output, Variable):
-                if output.owner is None:
-                    output.owner = self
-                    output.index = i
-                elif output.owner is not self or output.index != i:
-                    raise ValueError(
-                        "All output variables passed to Apply must belong to it."
-                    )
-                self.outputs.append(output)
-            else:
+        self.outputs: list[Variable] = list(outputs)
+        for i, output in enumerate(self.outputs):
+            if not isinstance(output, Variable):
                 raise TypeError(
                     f"The 'outputs' argument to Apply must contain Variable instances with no owner, not {output}"
                 )
+            if output.owner is None:
+                output.owner = self
+                output.index = i
+            elif output.owner is not self or output.index != i:
+                raise ValueError(
+                    "All output variables passed to Apply must belong to it."
+                )
+
+    @property
+    def tag(self) -> Scratchpad:
+        if (tag := self._tag) is None:
+            tag = self._tag = Scratchpad()
+        return tag
+
+    @tag.setter
+    def tag(self, value: Scratchpad) -> None:
+        self._tag = value
 
     def __getstate__(self):
-        d = self.__dict__
+        tag = self._tag
         # ufunc don't pickle/unpickle well
-        if hasattr(self.tag, "ufunc"):
-            d = copy(self.__dict__)
-            t = d["tag"]
-            del t.ufunc
-            d["tag"] = t
-        return d
+        if tag is not None and hasattr(tag, "ufunc"):
+            tag = copy(tag)
+            del tag.ufunc
+        return {
+            "op": self.op,
+            "inputs": self.inputs,
+            "outputs": self.outputs,
+            "tag": tag,
+        }
+
+    def __setstate__(self, state):
+        for attr, value in state.items():
+            setattr(self, attr, value)
 
     def default_output(self):
         """
@@ -255,7 +274,9 @@ class Apply(Node, Generic[OpType]):
         cp = self.__class__(
             new_op, self.inputs, [output.clone() for output in self.outputs]
         )
-        cp.tag = copy(self.tag)
+        # There is nothing to copy if the tag was never created
+        if self._tag is not None:
+            cp.tag = copy(self._tag)
         return cp
 
     def clone_with_new_inputs(
@@ -295,6 +316,15 @@ class Apply(Node, Generic[OpType]):
         # as the output type depends on the input values and not just their types
         output_type_depends_on_input_value = self.op._output_type_depends_on_input_value
 
+        # Fast path: the new inputs have exactly the same types, so the node can be cloned as is
+        if not output_type_depends_on_input_value and all(
+            curr.type == new.type
+            for curr, new in zip(self.inputs, new_inputs, strict=True)
+        ):
+            new_node = self.clone(clone_inner_graph=clone_inner_graph)
+            new_node.inputs = new_inputs
+            return new_node
+
         for i, (curr, new) in enumerate(zip(self.inputs, new_inputs, strict=True)):
             # Check if the input type changed or if the Op has output types that depend on input values
             if (curr.type != new.type) or output_type_depends_on_input_value:
@@ -318,7 +348,8 @@ class Apply(Node, Generic[OpType]):
                 new_op = new_op.clone()  # type: ignore
 
             new_node = new_op.make_node(*new_inputs)
-            new_node.tag = copy(self.tag).__update__(new_node.tag)
+            if self._tag is not None:
+                new_node.tag = copy(self._tag).__update__(new_node.tag)
         else:
             new_node = self.clone(clone_inner_graph=clone_inner_graph)
             new_node.inputs = new_inputs
@@ -450,6 +481,8 @@ class Variable(Node, Generic[_TypeType, OptionalApplyType]):
     __count__ = count(0)
 
     owner: OptionalApplyType
+    # Cache of functions compiled by `eval`, created on first use
+    _fn_cache: dict | None = None
 
     def __init__(
         self,
@@ -497,12 +530,12 @@ class Variable(Node, Generic[_TypeType, OptionalApplyType]):
         """Return a ``str`` representation of the `Variable`."""
         if self.name is not None:
             return self.name
-        if self.owner is not None:
-            op = self.owner.op
+        if (owner := self.owner) is not None:
+            op = owner.op
             if self.index == op.default_output:
-                return str(self.owner.op) + ".out"
+                return f"{op}.out"
             else:
-                return str(self.owner.op) + "." + str(self.index)
+                return f"{op}.{self.index}"
         else:
             return f"<{self.type}>"
 
@@ -620,15 +653,20 @@ class Variable(Node, Generic[_TypeType, OptionalApplyType]):
         function, so don't use it too much in real scripts.
         """
         from pytensor.compile.function import function
-        from pytensor.graph.traversal import get_var_by_name
+        from pytensor.graph.traversal import _get_vars_by_names
 
         ignore_unused_input = kwargs.get("on_unused_input", None) in ("ignore", "warn")
 
         def convert_string_keys_to_variables(inputs_to_values) -> dict["Variable", Any]:
+            # Look up all the string keys with a single traversal of the graph
+            string_keys = [key for key in inputs_to_values if isinstance(key, str)]
+            vars_by_name = (
+                _get_vars_by_names([self], string_keys) if string_keys else {}
+            )
             new_input_to_values = {}
             for key, value in inputs_to_values.items():
                 if isinstance(key, str):
-                    matching_vars = get_var_by_name([self], key)
+                    matching_vars = vars_by_name[key]
                     if not matching_vars:
                         if not ignore_unused_input:
                             raise ValueError(f"{key} not found in graph")
@@ -644,20 +682,22 @@ class Variable(Node, Generic[_TypeType, OptionalApplyType]):
         if inputs_to_values is not None:
             parsed_inputs_to_values = convert_string_keys_to_variables(inputs_to_values)
 
-        if not hasattr(self, "_fn_cache"):
-            self._fn_cache: dict = dict()
+        if self._fn_cache is None:
+            self._fn_cache = {}
 
-        inputs = tuple(sorted(parsed_inputs_to_values, key=id))
-        cache_key = (inputs, tuple(kwargs.items()))
+        # The compiled function only depends on the set of inputs, so we cache it
+        # together with the input order that was used to compile it
+        cache_key = (frozenset(parsed_inputs_to_values), tuple(kwargs.items()))
         try:
-            fn = self._fn_cache[cache_key]
+            inputs, fn = self._fn_cache[cache_key]
         except (KeyError, TypeError):
             fn = None
 
         if fn is None:
+            inputs = tuple(parsed_inputs_to_values)
             fn = function(inputs, self, **kwargs)
             try:
-                self._fn_cache[cache_key] = fn
+                self._fn_cache[cache_key] = (inputs, fn)
             except TypeError as exc:
                 warnings.warn(
                     "Keyword arguments could not be used to create a cache key for the underlying variable. "
@@ -729,27 +769,38 @@ class AtomicVariable(Variable[_TypeType, None]):
 class NominalVariable(Generic[_TypeType, _IdType], AtomicVariable[_TypeType]):
     """A variable that enables alpha-equivalent comparisons."""
 
-    __instances__: dict[tuple["Type", Hashable], "NominalVariable"] = {}
+    __instances__: WeakValueDictionary[tuple["Type", Hashable], "NominalVariable"] = (
+        WeakValueDictionary()
+    )
+    _subclass_cache: dict[tuple[type, type], type] = {}
 
     def __new__(cls, id: _IdType, typ: _TypeType, **kwargs):
-        if (typ, id) not in cls.__instances__:
+        res = cls.__instances__.get((typ, id))
+        if res is None:
             var_type = typ.variable_type
-            type_name = f"Nominal{var_type.__name__}"
-
-            def _reduce(self):
-                return cls, (self.id, self.type)
-
-            def _str(self):
-                return f"*{self.id}-{var_type.__str__(self)}"
-
-            new_type = type(
-                type_name, (cls, var_type), {"__reduce__": _reduce, "__str__": _str}
-            )
-            res: NominalVariable = super().__new__(new_type)
+            # The generated subclass only depends on the variable type,
+            # so it is built once and shared by all nominal variables of that type
+            new_type = cls._subclass_cache.get((cls, var_type))
+            if new_type is None:
+                type_name = f"Nominal{var_type.__name__}"
+
+                def _reduce(self):
+                    return cls, (self.id, self.type)
+
+                def _str(self):
+                    return f"*{self.id}-{var_type.__str__(self)}"
+
+                new_type = type(
+                    type_name,
+                    (cls, var_type),
+                    {"__reduce__": _reduce, "__str__": _str},
+                )
+                cls._subclass_cache[(cls, var_type)] = new_type
 
+            res = super().__new__(new_type)
             cls.__instances__[(typ, id)] = res
 
-        return cls.__instances__[(typ, id)]
+        return res
 
     def __init__(self, id: _IdType, typ: _TypeType, name: str | None = None):
         self.id = id
@@ -913,7 +964,7 @@ def clone_node_and_cache(
     # Use a cached `Op` clone when available
     new_op: Op | None = cast(Optional["Op"], clone_d.get(node.op))
 
-    cloned_inputs: list[Variable] = [cast(Variable, clone_d[i]) for i in node.inputs]
+    cloned_inputs = cast(list[Variable], list(map(clone_d.__getitem__, node.inputs)))
 
     new_node = node.clone_with_new_inputs(
         cloned_inputs,
@@ -990,7 +1041,7 @@ def clone_get_equiv(
 
     # clone the inputs if necessary
     for input in inputs:
-        if not isinstance(input, Constant) and copy_inputs:
+        if copy_inputs and not isinstance(input, Constant):
             cpy = input.clone()
             cpy.owner = None
             cpy.index = None
@@ -1002,7 +1053,7 @@ def clone_get_equiv(
     for apply in toposort(outputs, blockers=inputs):
         for input in apply.inputs:
             if input not in memo:
-                if not isinstance(input, Constant) and copy_orphans:
+                if copy_orphans and not isinstance(input, Constant):
                     cpy = input.clone()
                     memo[input] = cpy
                 else:
@@ -1061,11 +1112,12 @@ def as_string(
         viewing convenience).
 
     """
-    from pytensor.graph.traversal import applys_between, orphans_between
+    from pytensor.graph.traversal import _split_between
 
     i = set(inputs)
 
-    orph = list(orphans_between(i, outputs))
+    orph_list, applys = _split_between(i, outputs)
+    orph = set(orph_list)
 
     multi = set()
     seen = set()
@@ -1075,7 +1127,7 @@ def as_string(
             multi.add(op)
         else:
             seen.add(op)
-    for op in applys_between(i, outputs):
+    for op in applys:
         for input in op.inputs:
             op2 = input.owner
             if input in i or input in orph or op2 is None:
@@ -1091,24 +1143,42 @@ def as_string(
         return multi_list.index(x) + 1
 
     def describe(r):
-        if r.owner is not None and r not in i and r not in orph:
-            op = r.owner
-            idx = op.outputs.index(r)
-            if len(op.outputs) == 1:
-                idxs = ""
-            else:
-                idxs = f"::{idx}"
-            if op in done:
-                return f"*{multi_index(op)}{idxs}"
+        # Depth-first description of the graph of `r`, using an explicit stack
+        # of (node, described inputs) pairs instead of recursion
+        stack: list[tuple[Apply, list[str]]] = []
+        while True:
+            s: str | None
+            if r.owner is not None and r not in i and r not in orph:
+                op = r.owner
+                idx = r.index
+                if len(op.outputs) == 1:
+                    idxs = ""
+                else:
+                    idxs = f"::{idx}"
+                if op in done:
+                    s = f"*{multi_index(op)}{idxs}"
+                else:
+                    done.add(op)
+                    stack.append((op, []))
+                    s = None
             else:
-                done.add(op)
-                s = node_formatter(op, [describe(input) for input in op.inputs])
+                s = leaf_formatter(r)
+
+            # Finish the description of every node whose inputs are all described,
+            # until we reach a node input that still needs to be described
+            while True:
+                if s is not None:
+                    if not stack:
+                        return s
+                    stack[-1][1].append(s)
+                op, input_strs = stack[-1]
+                if len(input_strs) < len(op.inputs):
+                    r = op.inputs[len(input_strs)]
+                    break
+                stack.pop()
+                s = node_formatter(op, input_strs)
                 if op in multi_list:
-                    return f"*{multi_index(op)} -> {s}"
-                else:
-                    return s
-        else:
-            return leaf_formatter(r)
+                    s = f"*{multi_index(op)} -> {s}"
 
     return [describe(output) for output in outputs]
 
@@ -1151,6 +1221,7 @@ def equal_computations(
         in_xs = []
     if in_ys is None:
         in_ys = []
+    in_xs_set = set(in_xs)
 
     for x, y in zip(xs, ys, strict=True):
         if not isinstance(x, Variable) and not isinstance(y, Variable):
@@ -1167,20 +1238,23 @@ def equal_computations(
         if x_is_owned != y_is_owned:
             return False
         if x_is_owned and y_is_owned:
-            if x.owner.outputs.index(x) != y.owner.outputs.index(y):
+            if x.index != y.index:
                 return False
-        if x not in in_xs and not (y.type.in_same_class(x.type)):
+        if (
+            x.type is not y.type
+            and x not in in_xs_set
+            and not y.type.in_same_class(x.type)
+        ):
             return False
 
     if len(in_xs) != len(in_ys):
         return False
 
     for _x, _y in zip(in_xs, in_ys, strict=True):
-        if not (_y.type.in_same_class(_x.type)):
+        if _x.type is not _y.type and not _y.type.in_same_class(_x.type):
             return False
 
     common = set(zip(in_xs, in_ys, strict=True))
-    different: set[tuple[Variable, Variable]] = set()
     for dx, dy in zip(xs, ys, strict=True):
         assert isinstance(dx, Variable)
         # We checked above that both dx and dy have an owner or not
@@ -1193,79 +1267,95 @@ def equal_computations(
             elif (dx, dy) not in common and dx != dy:
                 return False
 
-    # Explore the two graphs, in parallel, depth first, comparing the nodes
-    # along the way for equality.
-    def compare_nodes(nd_x, nd_y, common, different):
-        """
-        Compare two nodes to determine if they perform equal computation.
-        This is done by comparing the ops, the number of inputs, outputs and
-        by ensuring that the inputs themselves are the result of equal
-        computation.
+    def check_nodes(nd_x, nd_y) -> bool | None:
+        """Compare two nodes without looking at their inputs.
 
-        NOTE : This function relies on the variable common to cache
-        results to be more efficient.
+        Returns ``True`` or ``False`` if the nodes are known to perform equal
+        computations or not, and ``None`` if their inputs must be compared.
 
         """
         if nd_x is nd_y:
             return True
 
-        if nd_x.op != nd_y.op:
+        # Ops are often shared between nodes, avoid comparing their props then
+        if nd_x.op is not nd_y.op and nd_x.op != nd_y.op:
             return False
         elif len(nd_x.inputs) != len(nd_y.inputs):
             return False
         elif len(nd_x.outputs) != len(nd_y.outputs):
             return False
-        else:
-            all_in_common = True
-            for dx, dy in zip(nd_x.outputs, nd_y.outputs, strict=True):
-                if (dx, dy) in different:
-                    return False
-                if (dx, dy) not in common:
-                    all_in_common = False
+        elif all(
+            (dx, dy) in common
+            for dx, dy in zip(nd_x.outputs, nd_y.outputs, strict=True)
+        ):
+            return True
+        return None
 
-            if all_in_common:
-                return True
+    # Explore the two graphs, in parallel, depth first, comparing the nodes
+    # along the way for equality.
+    def compare_nodes(nd_x, nd_y) -> bool:
+        """
+        Compare two nodes to determine if they perform equal computation.
+        This is done by comparing the ops, the number of inputs, outputs and
+        by ensuring that the inputs themselves are the result of equal
+        computation.
+
+        NOTE : This function relies on the variable common to cache
+        results to be more efficient.
 
+        """
+        if (is_equal := check_nodes(nd_x, nd_y)) is not None:
+            return is_equal
+
+        # Explicit stack of the nodes being compared, with an iterator over
+        # the pairs of inputs that remain to be compared
+        stack = [(nd_x, nd_y, zip(nd_x.inputs, nd_y.inputs, strict=True))]
+        while stack:
+            nd_x, nd_y, inputs = stack[-1]
             # Compare the individual inputs for equality
-            for dx, dy in zip(nd_x.inputs, nd_y.inputs, strict=True):
-                if (dx, dy) not in common:
-                    # Equality between the variables is unknown, compare
-                    # their respective owners, if they have some
-                    if (
-                        dx.owner
-                        and dy.owner
-                        and dx.owner.outputs.index(dx) == dy.owner.outputs.index(dy)
-                    ):
-                        nodes_equal = compare_nodes(
-                            dx.owner, dy.owner, common, different
+            for dx, dy in inputs:
+                if (dx, dy) in common:
+                    continue
+                # Equality between the variables is unknown, compare
+                # their respective owners, if they have some
+                if dx.owner and dy.owner and dx.index == dy.index:
+                    is_equal = check_nodes(dx.owner, dy.owner)
+                    if is_equal is None:
+                        # Compare the inputs of the owners before resuming
+                        stack.append(
+                            (
+                                dx.owner,
+                                dy.owner,
+                                zip(dx.owner.inputs, dy.owner.inputs, strict=True),
+                            )
                         )
-                        if not nodes_equal:
-                            different.add((dx, dy))
-                            return False
-
-                    # If both variables don't have an owner, then they are
-                    # inputs and can be directly compared
-                    elif dx.owner is None and dy.owner is None:
-                        if dx != dy:
-                            if isinstance(dx, Constant) and isinstance(dy, Constant):
-                                if not dx.equals(dy):
-                                    if strict_dtype:
-                                        return False
-                                    elif not np.array_equal(dx.data, dy.data):
-                                        return False
-                            else:
-                                return False
-
-                    else:
+                        break
+                    if not is_equal:
                         return False
 
-            # If the code reaches this statement then the inputs are pair-wise
-            # equivalent so the outputs of the current nodes are also
-            # pair-wise equivalents
-            for dx, dy in zip(nd_x.outputs, nd_y.outputs, strict=True):
-                common.add((dx, dy))
+                # If both variables don't have an owner, then they are
+                # inputs and can be directly compared
+                elif dx.owner is None and dy.owner is None:
+                    if dx != dy:
+                        if isinstance(dx, Constant) and isinstance(dy, Constant):
+                            if not dx.equals(dy):
+                                if strict_dtype:
+                                    return False
+                                elif not np.array_equal(dx.data, dy.data):
+                                    return False
+                        else:
+                            return False
 
-            return True
+                else:
+                    return False
+            else:
+                # If the code reaches this statement then the inputs are pair-wise
+                # equivalent so the outputs of the current nodes are also
+                # pair-wise equivalents
+                stack.pop()
+                common.update(zip(nd_x.outputs, nd_y.outputs, strict=True))
+
+        return True
 
     # Validate that each xs[i], ys[i] pair represents the same computation
     for i in range(len(xs)):
@@ -1274,8 +1364,7 @@ def equal_computations(
             y_i: Variable = cast(Variable, ys[i])
             # The case where pairs of x[i]s and y[i]s don't both have an owner
             # have already been addressed.
-            is_equal = compare_nodes(x_i.owner, y_i.owner, common, different)
-            if not is_equal:
+            if not compare_nodes(x_i.owner, y_i.owner):
                 return False
 
     return True
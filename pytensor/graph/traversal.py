@@ -1,6 +1,7 @@
 from collections import deque
 from collections.abc import (
     Callable,
+    Collection,
     Generator,
     Iterable,
     Reversible,
@@ -67,8 +68,20 @@ def walk(
     """
 
     rval_set: set[T] = set()
-    nodes = deque(nodes)
-    nodes_pop: Callable[[], T] = nodes.popleft if bfs else nodes.pop
+    # Bind the bound methods used in the hot loop to locals,
+    # to avoid repeated attribute lookups for every visited node
+    nodes_pop: Callable[[], T]
+    nodes_extend: Callable[[Iterable[T]], None]
+    if bfs:
+        queue = deque(nodes)
+        nodes_pop = queue.popleft
+        nodes_extend = queue.extend
+    else:
+        # A plain list is a faster stack than a deque
+        stack = list(nodes)
+        nodes_pop = stack.pop
+        nodes_extend = stack.extend
+    rval_add = rval_set.add
     node: T
     new_nodes: Iterable[T] | None
     try:
@@ -78,18 +91,18 @@ def walk(
                 if node not in rval_set:
                     new_nodes = expand(node)
                     yield node, new_nodes
-                    rval_set.add(node)
+                    rval_add(node)
                     if new_nodes:
-                        nodes.extend(new_nodes)
+                        nodes_extend(new_nodes)
         else:
             while True:
                 node = nodes_pop()
                 if node not in rval_set:
                     yield node
-                    rval_set.add(node)
+                    rval_add(node)
                     new_nodes = expand(node)
                     if new_nodes:
-                        nodes.extend(new_nodes)
+                        nodes_extend(new_nodes)
     except IndexError:
         return None
 
@@ -116,28 +129,66 @@ def ancestors(
         started at the variables in `graphs`.
     """
 
-    seen = set()
+    seen: set[Variable] = set()
+    seen_add = seen.add
     queue = list(graphs)
+    queue_pop = queue.pop
+    queue_extend = queue.extend
     try:
         if blockers:
             blockers = frozenset(blockers)
             while True:
-                if (var := queue.pop()) not in seen:
+                if (var := queue_pop()) not in seen:
                     yield var
-                    seen.add(var)
+                    seen_add(var)
                     if var not in blockers and (apply := var.owner) is not None:
-                        queue.extend(apply.inputs)
+                        queue_extend(apply.inputs)
         else:
             while True:
-                if (var := queue.pop()) not in seen:
+                if (var := queue_pop()) not in seen:
                     yield var
-                    seen.add(var)
+                    seen_add(var)
                     if (apply := var.owner) is not None:
-                        queue.extend(apply.inputs)
+                        queue_extend(apply.inputs)
     except IndexError:
         return
 
 
+def ancestors_list(
+    graphs: Iterable[Variable],
+    blockers: Iterable[Variable] | None = None,
+) -> list[Variable]:
+    r"""Return a list of the variables that contribute to those in given graphs (inclusive), stopping at blockers.
+
+    This is equivalent to ``list(ancestors(graphs, blockers))``, but avoids the
+    generator overhead when all the ancestors are needed anyway.
+    See `ancestors` for details.
+    """
+    seen: set[Variable] = set()
+    seen_add = seen.add
+    res: list[Variable] = []
+    res_append = res.append
+    queue = list(graphs)
+    queue_pop = queue.pop
+    queue_extend = queue.extend
+    if blockers:
+        blockers = frozenset(blockers)
+        while queue:
+            if (var := queue_pop()) not in seen:
+                res_append(var)
+                seen_add(var)
+                if var not in blockers and (apply := var.owner) is not None:
+                    queue_extend(apply.inputs)
+    else:
+        while queue:
+            if (var := queue_pop()) not in seen:
+                res_append(var)
+                seen_add(var)
+                if (apply := var.owner) is not None:
+                    queue_extend(apply.inputs)
+    return res
+
+
 variable_ancestors = ancestors
 
 
@@ -175,7 +226,9 @@ def graph_inputs(
         Input nodes with no owner, in the order found by a breath first search started at the nodes in `graphs`.
 
     """
-    yield from (var for var in ancestors(graphs, blockers) if var.owner is None)
+    for var in ancestors(graphs, blockers):
+        if var.owner is None:
+            yield var
 
 
 def explicit_graph_inputs(
@@ -253,13 +306,18 @@ def vars_between(
 
     """
 
-    def expand(var: Variable, ins=frozenset(ins)) -> Iterable[Variable] | None:
-        if var.owner is not None and var not in ins:
-            return (*var.owner.inputs, *var.owner.outputs)
-        return None
-
-    # With bfs = False, it iterates similarly to ancestors
-    yield from walk(outs, expand, bfs=False)
+    ins = frozenset(ins)
+    # Same depth-first traversal as `walk(outs, expand, bfs=False)`, with the inputs
+    # and outputs of each owner pushed directly on the stack, without an intermediate tuple
+    seen: set[Variable] = set()
+    stack = list(outs)
+    while stack:
+        if (var := stack.pop()) not in seen:
+            yield var
+            seen.add(var)
+            if (node := var.owner) is not None and var not in ins:
+                stack.extend(node.inputs)
+                stack.extend(node.outputs)
 
 
 def orphans_between(
@@ -298,6 +356,29 @@ def orphans_between(
     )
 
 
+def _split_between(
+    ins: Collection[Variable], outs: Iterable[Variable]
+) -> tuple[list[Variable], list[Apply]]:
+    r"""Return the orphans and the `Apply`\s between `ins` and `outs` in a single traversal.
+
+    This is equivalent to ``(list(orphans_between(ins, outs)), list(applys_between(ins, outs)))``,
+    up to the order of the `Apply`\s.
+
+    """
+    orphans = []
+    applys = []
+    seen_applys = set()
+    for var in vars_between(ins, outs):
+        if var in ins:
+            continue
+        if (node := var.owner) is None:
+            orphans.append(var)
+        elif node not in seen_applys:
+            seen_applys.add(node)
+            applys.append(node)
+    return orphans, applys
+
+
 def applys_between(
     ins: Iterable[Variable], outs: Iterable[Variable]
 ) -> Generator[Apply, None, None]:
@@ -342,11 +423,23 @@ def apply_depends_on(apply: Apply, depends_on: Apply | Iterable[Apply]) -> bool:
     """
     if isinstance(depends_on, Apply):
         depends_on = frozenset((depends_on,))
-    else:
+    elif not isinstance(depends_on, set | frozenset):
+        # Sets can be used as they are, other iterables may not support fast lookup
         depends_on = frozenset(depends_on)
-    return (apply in depends_on) or any(
-        apply in depends_on for apply in apply_ancestors(apply.inputs)
-    )
+    if apply in depends_on:
+        return True
+
+    # Walk the Apply nodes directly, stopping as soon as a dependency is found
+    visited = {apply}
+    todo = [apply]
+    while todo:
+        for inp in todo.pop().inputs:
+            if (owner := inp.owner) is not None and owner not in visited:
+                if owner in depends_on:
+                    return True
+                visited.add(owner)
+                todo.append(owner)
+    return False
 
 
 def variable_depends_on(
@@ -372,10 +465,31 @@ def variable_depends_on(
     bool
     """
     if isinstance(depends_on, Variable):
-        depends_on_set = frozenset((depends_on,))
-    else:
-        depends_on_set = frozenset(depends_on)
-    return any(var in depends_on_set for var in variable_ancestors([variable]))
+        depends_on = frozenset((depends_on,))
+    elif not isinstance(depends_on, set | frozenset):
+        # Sets can be used as they are, other iterables may not support fast lookup
+        depends_on = frozenset(depends_on)
+
+    return _any_ancestor_in([variable], depends_on)
+
+
+def _any_ancestor_in(
+    variables: Iterable[Variable], depends_on: Collection[Variable]
+) -> bool:
+    """Check if any of the ancestors of `variables` (inclusive) is in `depends_on`."""
+    if not depends_on:
+        return False
+    # Same traversal as `ancestors`, inlined to stop as soon as a dependency is found
+    seen: set[Variable] = set()
+    stack = list(variables)
+    while stack:
+        if (var := stack.pop()) not in seen:
+            if var in depends_on:
+                return True
+            seen.add(var)
+            if (apply := var.owner) is not None:
+                stack.extend(apply.inputs)
+    return False
 
 
 def truncated_graph_inputs(
@@ -486,7 +600,10 @@ def truncated_graph_inputs(
                     #  It seems the only reason we are expanding on these inputs is to find other ancestors_to_include
                     #  (instead of treating them as disconnected), but this may yet cause other unrelated variables
                     #  to become "independent" in the process
-                    if variable_depends_on(variable, ancestors_to_include - {variable}):
+                    # We check the inputs, as the variable itself is in ancestors_to_include
+                    if variable.owner is not None and _any_ancestor_in(
+                        variable.owner.inputs, ancestors_to_include
+                    ):
                         # owner can never be None for a dependent variable
                         candidates.extend(
                             n for n in variable.owner.inputs if n not in seen
@@ -495,9 +612,11 @@ def truncated_graph_inputs(
                     # A regular variable to check
                     # if we've found an independent variable and it is not in blockers so far
                     # it is a new independent variable not present in ancestors to include
-                    if variable_depends_on(variable, blockers):
+                    if _any_ancestor_in((variable,), blockers):
                         # If it's not an independent variable, inputs become candidates
-                        candidates.extend(variable.owner.inputs)
+                        candidates.extend(
+                            n for n in variable.owner.inputs if n not in seen
+                        )
                     else:
                         # otherwise it's a truncated input itself
                         truncated_inputs.append(variable)
@@ -533,45 +652,45 @@ def walk_toposort(
     returned by the `deps` function.
     """
 
-    # Cache the dependencies (ancestors) as we iterate over the nodes with the deps function
-    deps_cache: dict[T, list[T]] = {}
-
-    def compute_deps_cache(obj, deps_cache=deps_cache):
-        if obj in deps_cache:
-            return deps_cache[obj]
-        d = deps_cache[obj] = deps(obj) or []
-        return d
-
     clients: dict[T, list[T]] = {}
+    # Number of dependencies of each node that have not been yielded yet
+    pending: dict[T, int] = {}
     sources: deque[T] = deque()
-    total_nodes = 0
-    for node, children in walk(
-        graphs, compute_deps_cache, bfs=False, return_children=True
-    ):
-        total_nodes += 1
-        # Mypy doesn't know that toposort will not return `None` because of our `or []` in the `compute_deps_cache`
-        for child in children:  # type: ignore
-            clients.setdefault(child, []).append(node)
-        if not deps_cache[node]:
-            # Add nodes without dependencies to the stack
-            sources.append(node)
-
-    rset: set[T] = set()
+
+    # Depth-first search of all the nodes (equivalent to `walk` with `bfs=False`),
+    # inlined to collect the clients and dependency counts in the same pass
+    seen: set[T] = set()
+    stack = list(graphs)
+    while stack:
+        if (node := stack.pop()) not in seen:
+            seen.add(node)
+            n_deps = 0
+            if children := deps(node):
+                for child in children:
+                    clients.setdefault(child, []).append(node)
+                    n_deps += 1
+                stack.extend(children)
+            if n_deps:
+                pending[node] = n_deps
+            else:
+                # Add nodes without dependencies to the stack
+                sources.append(node)
+    total_nodes = len(seen)
+
     try:
         while True:
-            if (node := sources.popleft()) not in rset:
-                yield node
-                total_nodes -= 1
-                rset.add(node)
-                # Iterate over each client node (that is, it depends on the current node)
-                for client in clients.get(node, []):
-                    # Remove itself from the dependent (ancestor) list of each client
-                    d = deps_cache[client] = [
-                        a for a in deps_cache[client] if a is not node
-                    ]
-                    if not d:
-                        # If there are no dependencies left to visit for this node, add it to the stack
-                        sources.append(client)
+            node = sources.popleft()
+            yield node
+            total_nodes -= 1
+            # Iterate over each client node (that is, it depends on the current node)
+            for client in clients.get(node, ()):
+                # A client shows up once per dependency on `node`, so we
+                # decrement its count of dependencies left to visit each time
+                if n_deps := pending[client] - 1:
+                    pending[client] = n_deps
+                else:
+                    # If there are no dependencies left to visit for this node, add it to the stack
+                    sources.append(client)
     except IndexError:
         pass
 
@@ -628,23 +747,24 @@ def toposort(
 
     # We can put blocker variables in computed, as we only return apply nodes
     computed = set(blockers or ())
-    todo = list(graphs)
-    try:
-        while True:
-            if (cur := todo.pop()) not in computed and (apply := cur.owner) is not None:
-                uncomputed_inputs = tuple(
-                    i
-                    for i in apply.inputs
-                    if (i not in computed and i.owner is not None)
-                )
-                if not uncomputed_inputs:
-                    yield apply
-                    computed.update(apply.outputs)
-                else:
-                    todo.append(cur)
-                    todo.extend(uncomputed_inputs)
-    except IndexError:  # queue is empty
-        return
+    computed_update = computed.update
+    for out in reversed(list(graphs)):
+        if out in computed or (apply := out.owner) is None:
+            continue
+        # Right-to-left post-order DFS. Each frame holds an Apply node and an iterator
+        # over its inputs, so that every input is only checked once.
+        stack = [(apply, reversed(apply.inputs))]
+        while stack:
+            apply, inputs_iter = stack[-1]
+            for i in inputs_iter:
+                if i not in computed and (i_apply := i.owner) is not None:
+                    stack.append((i_apply, reversed(i_apply.inputs)))
+                    break
+            else:
+                # All inputs are computed
+                stack.pop()
+                yield apply
+                computed_update(apply.outputs)
 
 
 def toposort_with_orderings(
@@ -753,21 +873,36 @@ def get_var_by_name(
     -------
     A ``tuple`` containing all the `Variable`\s that match `target_var_id`.
 
+    """
+    return tuple(_get_vars_by_names(graphs, (target_var_id,))[target_var_id])
+
+
+def _get_vars_by_names(
+    graphs: Iterable[Variable], target_var_ids: Iterable[str]
+) -> dict[str, list[Variable]]:
+    """Get the variables matching each of `target_var_ids` in a single graph traversal.
+
+    See `get_var_by_name` for details.
     """
     from pytensor.graph.op import HasInnerGraph
 
-    def expand(r: Variable) -> list[Variable] | None:
-        if (apply := r.owner) is not None:
+    results: dict[str, list[Variable]] = {
+        target_var_id: [] for target_var_id in target_var_ids
+    }
+    # Breadth-first search of the graphs, including the inner graphs of the Ops,
+    # equivalent to `walk` with `bfs=True`
+    seen: set[Variable] = set()
+    queue = deque(graphs)
+    while queue:
+        if (var := queue.popleft()) in seen:
+            continue
+        seen.add(var)
+        if (name := var.name) in results:
+            results[name].append(var)
+        if (auto_name := var.auto_name) != name and auto_name in results:
+            results[auto_name].append(var)
+        if (apply := var.owner) is not None:
+            queue.extend(apply.inputs)
             if isinstance(apply.op, HasInnerGraph):
-                return [*apply.inputs, *apply.op.inner_outputs]
-            else:
-                # Mypy doesn't know these will never be None
-                return apply.inputs  # type: ignore
-        else:
-            return None
-
-    return tuple(
-        var
-        for var in walk(graphs, expand)
-        if (target_var_id == var.name or target_var_id == var.auto_name)
-    )
+                queue.extend(apply.op.inner_outputs)
+    return results
@@ -278,22 +278,22 @@ class Scratchpad:
         for k, v in self.__dict__.items():
             print(f"  {k}: {v}")  # noqa: T201
 
-    # These two methods have been added to help Mypy
-    def __getattribute__(self, name):
-        return super().__getattribute__(name)
+    if TYPE_CHECKING:
+        # These two methods have been added to help Mypy.
+        # They are not defined at runtime, as they would slow down every tag access.
+        def __getattribute__(self, name):
+            return super().__getattribute__(name)
 
-    def __setattr__(self, name: str, value: Any) -> None:
-        self.__dict__[name] = value
+        def __setattr__(self, name: str, value: Any) -> None:
+            self.__dict__[name] = value
 
 
 class ValidatingScratchpad(Scratchpad):
     """This `Scratchpad` validates attribute values."""
 
     def __init__(self, attr, attr_filter):
-        super().__init__()
-
-        object.__setattr__(self, "attr", attr)
-        object.__setattr__(self, "attr_filter", attr_filter)
+        # Bypass our own `__setattr__`
+        self.__dict__.update(attr=attr, attr_filter=attr_filter)
 
     def __setattr__(self, attr, obj):
         if getattr(self, "attr", None) == attr:
@@ -3,12 +3,13 @@ from collections.abc import Callable, Sequence
 from copy import copy, deepcopy
 from typing import TYPE_CHECKING, Any, Optional, Union
 
+import numpy as np
+
 from pytensor.configdefaults import config
 from pytensor.graph.basic import Apply, Variable
 from pytensor.graph.fg import FunctionGraph
 from pytensor.graph.type import Type
-from pytensor.link.utils import gc_helper, map_storage, raise_with_op, streamline
-from pytensor.utils import difference
+from pytensor.link.utils import map_storage, raise_with_op, streamline
 
 
 if TYPE_CHECKING:
@@ -52,6 +53,19 @@ class Container:
 
     """
 
+    __slots__ = (
+        "_has_filter_inplace",
+        "allow_downcast",
+        "implicit",
+        "name",
+        "provided",
+        "readonly",
+        "required",
+        "storage",
+        "strict",
+        "type",
+    )
+
     def __init__(
         self,
         r: Variable | Type,
@@ -79,6 +93,23 @@ class Container:
         self.readonly = readonly
         self.strict = strict
         self.allow_downcast = allow_downcast
+        # Most Types don't implement `filter_inplace`, check once instead of
+        # raising and catching NotImplementedError on every set
+        self._has_filter_inplace = (
+            type(self.type).filter_inplace is not Type.filter_inplace
+        )
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {k: getattr(self, k) for k in self.__slots__ if hasattr(self, k)}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        for k, v in state.items():
+            setattr(self, k, v)
+        if "_has_filter_inplace" not in state:
+            # Pickled before the check was cached
+            self._has_filter_inplace = (
+                type(self.type).filter_inplace is not Type.filter_inplace
+            )
 
     def __get__(self) -> Any:
         return self.storage[0]
@@ -97,13 +128,16 @@ class Container:
             if self.allow_downcast is not None:
                 kwargs["allow_downcast"] = self.allow_downcast
 
-            try:
-                # Use in-place filtering when/if possible
-                self.storage[0] = self.type.filter_inplace(
-                    value, self.storage[0], **kwargs
-                )
-            except NotImplementedError:
-                self.storage[0] = self.type.filter(value, **kwargs)
+            if self._has_filter_inplace:
+                try:
+                    # Use in-place filtering when/if possible
+                    self.storage[0] = self.type.filter_inplace(
+                        value, self.storage[0], **kwargs
+                    )
+                    return
+                except NotImplementedError:
+                    pass
+            self.storage[0] = self.type.filter(value, **kwargs)
 
         except Exception as e:
             e.args = (*e.args, f'Container name "{self.name}"')
@@ -120,13 +154,15 @@ class Container:
 
     def __deepcopy__(self, memo: dict[int, Any]) -> "Container":
         data_was_in_memo = id(self.storage[0]) in memo
+        # Types are immutable and the flags are bools/str, so only the
+        # storage needs to be copied
         r = type(self)(
-            deepcopy(self.type, memo=memo),
+            self.type,
             deepcopy(self.storage, memo=memo),
-            readonly=deepcopy(self.readonly, memo=memo),
-            strict=deepcopy(self.strict, memo=memo),
-            allow_downcast=deepcopy(self.allow_downcast, memo=memo),
-            name=deepcopy(self.name, memo=memo),
+            readonly=self.readonly,
+            strict=self.strict,
+            allow_downcast=self.allow_downcast,
+            name=self.name,
         )
         # Work around NumPy deepcopy of ndarray with 0 dimension that
         # don't return an ndarray.
@@ -346,35 +382,44 @@ class PerformLinker(LocalLinker):
             # the python version
             # Note : ops that implement their own make thunk don't usually
             # have this attribute defined !!
-            thunks += [
-                node.op.make_thunk(node, storage_map, compute_map, no_recycling, "py")
-            ]
-            thunks[-1].inputs = [storage_map[v] for v in node.inputs]
-            thunks[-1].outputs = [storage_map[v] for v in node.outputs]
-
-        computed, last_user = gc_helper(order)
-        post_thunk_old_storage = [] if self.allow_gc else None
-
-        for node in order:
-            if self.allow_gc:
+            thunk = node.op.make_thunk(
+                node, storage_map, compute_map, no_recycling, "py"
+            )
+            thunk.inputs = [storage_map[v] for v in node.inputs]
+            thunk.outputs = [storage_map[v] for v in node.outputs]
+            thunks.append(thunk)
+
+        if self.allow_gc:
+            # Walking the nodes backwards, the first node that uses a computed
+            # variable is its last user, after which its storage can be freed.
+            # Inputs and outputs are never freed.
+            seen = {*fgraph.inputs, *fgraph.outputs}
+            post_thunk_old_storage = []
+            for node in reversed(order):
                 post_thunk_old_storage.append(
-                    [
+                    tuple(
                         storage_map[input]
                         for input in node.inputs
-                        if (input in computed)
-                        and (input not in fgraph.outputs)
-                        and (node == last_user[input])
-                    ]
+                        if input.owner is not None and input not in seen
+                    )
                 )
+                seen.update(node.inputs)
+            post_thunk_old_storage.reverse()
+        else:
+            post_thunk_old_storage = None
 
         if no_recycling is True:
             # True seems like some special code for *everything*?? -JB
             # FunctionMaker always passes a list I think   -JB
-            no_recycling = list(storage_map.values())
-            no_recycling = difference(no_recycling, input_storage)
+            # Storage cells are unhashable lists, compare them by identity
+            input_storage_ids = {id(s) for s in input_storage}
+            no_recycling = [
+                s for s in storage_map.values() if id(s) not in input_storage_ids
+            ]
         else:
+            fgraph_inputs = set(fgraph.inputs)
             no_recycling = [
-                storage_map[r] for r in no_recycling if r not in fgraph.inputs
+                storage_map[r] for r in no_recycling if r not in fgraph_inputs
             ]
 
         # The function that actually runs your program is one of the f's in streamline.
@@ -532,6 +577,7 @@ class WrapLinker(Linker):
         thunk_groups = list(zip(*thunk_lists, strict=True))
         order = [x[0] for x in zip(*order_lists, strict=True)]
 
+        no_recycling = set(no_recycling)
         to_reset = [
             thunk.outputs[j]
             for thunks, node in zip(thunk_groups, order, strict=True)
@@ -547,7 +593,13 @@ class WrapLinker(Linker):
             for inputs in input_lists[1:]:
                 # zip strict not specified because we are in a hot loop
                 for input1, input2 in zip(inputs0, inputs):
-                    input2.storage[0] = copy(input1.storage[0])
+                    value = input1.storage[0]
+                    # Skip the generic `copy` dispatch for plain ndarrays, keeping
+                    # the memory layout like `ndarray.__copy__` does
+                    if type(value) is np.ndarray:
+                        input2.storage[0] = value.copy(order="K")
+                    else:
+                        input2.storage[0] = copy(value)
             for x in to_reset:
                 x[0] = None
             pre(self, [input.data for input in input_lists[0]], order, thunk_groups)
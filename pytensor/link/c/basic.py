@@ -1846,7 +1846,7 @@ class OpWiseCLinker(LocalLinker):
         for node in order:
             if self.allow_gc:
                 post_thunk_old_storage.append(
-                    [
+                    tuple(
                         storage_map[input]
                         for input in node.inputs
                         if (
@@ -1854,7 +1854,7 @@ class OpWiseCLinker(LocalLinker):
                             and (input not in fgraph.outputs)
                             and node == last_user[input]
                         )
-                    ]
+                    )
                 )
 
         if no_recycling is True:
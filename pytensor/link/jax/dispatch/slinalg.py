@@ -124,7 +124,7 @@ def jax_funcify_PivotToPermutation(op, **kwargs):
         p_inv = jax.lax.linalg.lu_pivots_to_permutation(pivots, pivots.shape[0])
         if inverse:
             return p_inv
-        return jax.numpy.argsort(p_inv)
+        return jax.numpy.argsort(p_inv).astype(p_inv.dtype)
 
     return pivot_to_permutations
 
@@ -8,13 +8,14 @@ from pytensor.tensor.slinalg import LU, Cholesky, Solve, SolveTriangular
 
 @mlx_funcify.register(Cholesky)
 def mlx_funcify_Cholesky(op, node, **kwargs):
-    lower = op.lower
+    upper = not op.lower
     a_dtype = getattr(mx, node.inputs[0].dtype)
+    stream = mx.cpu
 
     def cholesky(a):
-        return mx.linalg.cholesky(
-            a.astype(dtype=a_dtype, stream=mx.cpu), upper=not lower, stream=mx.cpu
-        )
+        if a.dtype != a_dtype:
+            a = a.astype(dtype=a_dtype, stream=stream)
+        return mx.linalg.cholesky(a, upper=upper, stream=stream)
 
     return cholesky
 
@@ -31,30 +32,33 @@ def mlx_funcify_Solve(op, node, **kwargs):
             UserWarning,
         )
 
+    # MLX only supports solve on CPU
+    stream = mx.cpu
+
     def solve(a, b):
-        # MLX only supports solve on CPU
-        return mx.linalg.solve(
-            a.astype(stream=mx.cpu, dtype=a_dtype),
-            b.astype(stream=mx.cpu, dtype=b_dtype),
-            stream=mx.cpu,
-        )
+        if a.dtype != a_dtype:
+            a = a.astype(stream=stream, dtype=a_dtype)
+        if b.dtype != b_dtype:
+            b = b.astype(stream=stream, dtype=b_dtype)
+        return mx.linalg.solve(a, b, stream=stream)
 
     return solve
 
 
 @mlx_funcify.register(SolveTriangular)
 def mlx_funcify_SolveTriangular(op, node, **kwargs):
-    lower = op.lower
+    upper = not op.lower
     A_dtype = getattr(mx, node.inputs[0].dtype)
     b_dtype = getattr(mx, node.inputs[1].dtype)
+    # MLX only supports solve_triangular on CPU
+    stream = mx.cpu
 
     def solve_triangular(A, b):
-        return mx.linalg.solve_triangular(
-            A.astype(stream=mx.cpu, dtype=A_dtype),
-            b.astype(stream=mx.cpu, dtype=b_dtype),
-            upper=not lower,
-            stream=mx.cpu,  # MLX only supports solve_triangular on CPU
-        )
+        if A.dtype != A_dtype:
+            A = A.astype(stream=stream, dtype=A_dtype)
+        if b.dtype != b_dtype:
+            b = b.astype(stream=stream, dtype=b_dtype)
+        return mx.linalg.solve_triangular(A, b, upper=upper, stream=stream)
 
     return solve_triangular
 
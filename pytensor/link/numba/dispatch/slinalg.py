@@ -111,11 +111,11 @@ def pivot_to_permutation(op, node, **kwargs):
         p_inv = _pivot_to_permutation(piv)
 
         if inverse:
-            return p_inv
+            return p_inv.astype(np.int32)
 
-        return np.argsort(p_inv)
+        return np.argsort(p_inv).astype(np.int32)
 
-    cache_version = 2
+    cache_version = 3
     return numba_pivot_to_permutation, cache_version
 
 
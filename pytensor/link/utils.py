@@ -145,7 +145,7 @@ def streamline(
     fgraph: FunctionGraph,
     thunks: Sequence[Callable[[], None]],
     order: Sequence[Apply],
-    post_thunk_old_storage: list["StorageCellType"] | None = None,
+    post_thunk_old_storage: Sequence[Sequence["StorageCellType"]] | None = None,
     no_recycling: list["StorageCellType"] | None = None,
     nice_errors: bool = True,
 ) -> "BasicThunkType":
@@ -160,8 +160,8 @@ def streamline(
         The list of apply instances that gave rise to the thunks
         (same order as thunks).
     post_thunk_old_storage
-        A list (corresponding to thunks, order) whose elements are lists of
-        storage cells, that should be cleared after running thecorresponding
+        A list (corresponding to thunks, order) whose elements are tuples of
+        storage cells, that should be cleared after running the corresponding
         thunk. A value of None disables this functionality.
     no_recycling
         Storage elements that cannot be 'recycled' by repeatedly executing the
@@ -195,8 +195,10 @@ def streamline(
                     thunks, order, post_thunk_old_storage, strict=False
                 ):
                     thunk()
-                    for old_s in old_storage:
-                        old_s[0] = None
+                    # Most nodes have nothing to free
+                    if old_storage:
+                        for old_s in old_storage:
+                            old_s[0] = None
             except Exception:
                 raise_with_op(fgraph, node, thunk)
 
@@ -344,7 +344,7 @@ class Loop(UpdatingVM):
         input_storage,
         output_storage,
         update_vars,
-        post_thunk_clear: list["StorageCellType"] | None = None,
+        post_thunk_clear: Sequence[Sequence["StorageCellType"]] | None = None,
     ):
         r"""
         Parameters
@@ -391,8 +391,9 @@ class Loop(UpdatingVM):
                     t1 = time.perf_counter()
                     self.call_counts[i] += 1
                     self.call_times[i] += t1 - t0
-                    for old_s in old_storage:
-                        old_s[0] = None
+                    if old_storage:
+                        for old_s in old_storage:
+                            old_s[0] = None
                     i += 1
             except Exception:
                 raise_with_op(self.fgraph, node, thunk)
@@ -404,8 +405,10 @@ class Loop(UpdatingVM):
                     self.thunks, self.nodes, self.post_thunk_clear, fillvalue=()
                 ):
                     thunk()
-                    for old_s in old_storage:
-                        old_s[0] = None
+                    # Most nodes have nothing to free
+                    if old_storage:
+                        for old_s in old_storage:
+                            old_s[0] = None
             except Exception:
                 raise_with_op(self.fgraph, node, thunk)
 
@@ -1275,7 +1278,7 @@ class VMLinker(LocalLinker):
         if self.allow_gc:
             post_thunk_clear = []
             for node in order:
-                clear_after_this_thunk = [
+                clear_after_this_thunk = tuple(
                     storage_map[input]
                     for input in node.inputs
                     if (
@@ -1284,7 +1287,7 @@ class VMLinker(LocalLinker):
                         and node == last_user[input]
                         and input not in reallocated_vars
                     )
-                ]
+                )
                 post_thunk_clear.append(clear_after_this_thunk)
         else:
             post_thunk_clear = None
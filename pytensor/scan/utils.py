@@ -355,7 +355,7 @@ def scan_can_remove_outs(op, out_idxs):
 
     """
     non_removable = [o for i, o in enumerate(op.inner_outputs) if i not in out_idxs]
-    required_inputs = list(graph_inputs(non_removable))
+    required_inputs = set(graph_inputs(non_removable))
 
     out_ins = []
     offset = op.info.n_seqs
@@ -379,10 +379,10 @@ def scan_can_remove_outs(op, out_idxs):
     while added:
         added = False
         for pos, idx in enumerate(out_idxs):
-            if out_idxs_mask[pos] and any(x in required_inputs for x in out_ins[idx]):
+            if out_idxs_mask[pos] and not required_inputs.isdisjoint(out_ins[idx]):
                 # This output is required ..
                 out_idxs_mask[pos] = 0
-                required_inputs += list(graph_inputs([op.inner_outputs[idx]]))
+                required_inputs.update(graph_inputs([op.inner_outputs[idx]]))
                 added = True
 
     required_outs = [x for i, x in enumerate(out_idxs) if out_idxs_mask[i] == 0]
@@ -1,13 +1,13 @@
 from typing import Literal, cast
 
 import numpy as np
-from scipy.linalg import get_lapack_funcs
 
 import pytensor
 import pytensor.tensor.basic as ptb
 import pytensor.tensor.math as ptm
 from pytensor.compile.builders import OpFromGraph
 from pytensor.graph import Apply, Op
+from pytensor.scan import scan, until
 from pytensor.tensor import TensorLike
 from pytensor.tensor.basic import as_tensor_variable, zeros
 from pytensor.tensor.blockwise import Blockwise
@@ -15,7 +15,15 @@ from pytensor.tensor.functional import vectorize
 from pytensor.tensor.nlinalg import kron, matrix_dot, norm
 from pytensor.tensor.reshape import join_dims
 from pytensor.tensor.shape import reshape
-from pytensor.tensor.slinalg import lu, qr, qz, schur, solve, solve_triangular
+from pytensor.tensor.slinalg import (
+    _get_lapack_func,
+    lu,
+    qr,
+    qz,
+    schur,
+    solve,
+    solve_triangular,
+)
 from pytensor.tensor.type import matrix
 from pytensor.tensor.variable import TensorVariable
 
@@ -64,17 +72,21 @@ class TRSYL(Op):
         X = outputs_storage[0]
 
         out_dtype = node.outputs[0].type.dtype
-        (trsyl,) = get_lapack_funcs(("trsyl",), (A, B, C))
 
         if A.size == 0 or B.size == 0:
-            return np.empty_like(C, dtype=out_dtype)
+            X[0] = np.empty_like(C, dtype=out_dtype)
+            return
 
+        trsyl = _get_lapack_func("trsyl", (A, B, C))
         Y, scale, info = trsyl(A, B, C, overwrite_c=self.overwrite_c)
 
         if info < 0:
-            return np.full_like(C, np.nan, dtype=out_dtype)
+            X[0] = np.full_like(C, np.nan, dtype=out_dtype)
+            return
 
-        Y *= scale
+        # trsyl returns the solution of the equation scaled by `scale` to avoid overflow
+        if scale != 1.0:
+            Y *= scale
         X[0] = Y
 
     def infer_shape(self, fgraph, node, shapes):
@@ -198,10 +210,42 @@ class SolveBilinearDiscreteLyapunov(OpFromGraph):
     """
 
 
+# Number of doublings used by the Smith method: the solution is summed over 2**30 terms of
+# the series, enough for A with spectral radius up to about 1 - 3e-8
+# Upper bound on the number of squarings. The series has converged long before for any A whose
+# spectral radius is not extremely close to one
+_SMITH_MAX_STEPS = 30
+
+
+def _smith_discrete_lyapunov(A: TensorVariable, Q: TensorVariable) -> TensorVariable:
+    """Sum the series :math:`X = \\sum_k A^k Q (A^H)^k` by repeated squaring of ``A``.
+
+    The iteration stops once the entries of the squared ``A`` fall below machine epsilon, or after
+    ``_SMITH_MAX_STEPS`` squarings.
+    """
+    dtype = pytensor.scalar.upcast(A.dtype, Q.dtype)
+    A = A.astype(dtype)
+    Q = Q.astype(dtype)
+    eps = np.finfo(dtype).eps
+
+    def smith_step(A_k, X_k):
+        A_next = A_k @ A_k
+        X_next = X_k + A_k @ X_k @ A_k.conj().mT
+        return (A_next, X_next), until(ptm.abs(A_next).max() < eps)
+
+    [_, X] = scan(
+        smith_step,
+        outputs_info=[A, Q],
+        n_steps=_SMITH_MAX_STEPS,
+        return_updates=False,
+    )
+    return cast(TensorVariable, X[-1])
+
+
 def solve_discrete_lyapunov(
     A: TensorLike,
     Q: TensorLike,
-    method: Literal["direct", "bilinear"] = "bilinear",
+    method: Literal["direct", "bilinear", "smith"] = "bilinear",
 ) -> TensorVariable:
     """Solve the discrete Lyapunov equation :math:`A X A^H - X = Q`.
 
@@ -211,11 +255,13 @@ def solve_discrete_lyapunov(
         Square matrix of shape N x N
     Q: TensorLike
         Square matrix of shape N x N
-    method: str, one of ``"direct"`` or ``"bilinear"``
+    method: str, one of ``"direct"``, ``"bilinear"`` or ``"smith"``
         Solver method used, . ``"direct"`` solves the problem directly via matrix inversion.  This has a pure
         PyTensor implementation and can thus be cross-compiled to supported backends, and should be preferred when
          ``N`` is not large. The direct method scales poorly with the size of ``N``, and the bilinear can be
-        used in these cases.
+        used in these cases. ``"smith"`` sums the series solution by repeated squaring of ``A``, stopping once
+        its powers vanish (after at most 30 squarings). It is also pure PyTensor and only uses matrix products,
+        but requires all eigenvalues of ``A`` to lie strictly inside the unit circle.
 
     Returns
     -------
@@ -223,9 +269,9 @@ def solve_discrete_lyapunov(
         Square matrix of shape ``N x N``. Solution to the Lyapunov equation
 
     """
-    if method not in ["direct", "bilinear"]:
+    if method not in ["direct", "bilinear", "smith"]:
         raise ValueError(
-            f'Parameter "method" must be one of "direct" or "bilinear", found {method}'
+            f'Parameter "method" must be one of "direct", "bilinear" or "smith", found {method}'
         )
 
     A = as_tensor_variable(A)
@@ -234,10 +280,13 @@ def solve_discrete_lyapunov(
     if method == "direct":
         vec_kron = vectorize(kron, signature="(n,n),(n,n)->(m,m)")
         AxA = vec_kron(A, A.conj())
-        I = ptb.eye(AxA.shape[-1])
+
+        # I - AxA, without allocating the N**2 x N**2 identity
+        diag_idx = ptb.arange(AxA.shape[-1])
+        I_minus_AxA = (-AxA)[..., diag_idx, diag_idx].inc(1)
 
         vec_Q = join_dims(Q, start_axis=-2, n_axes=2)
-        vec_X = solve(I - AxA, vec_Q, b_ndim=1)
+        vec_X = solve(I_minus_AxA, vec_Q, b_ndim=1)
 
         return reshape(vec_X, A.shape)
 
@@ -256,6 +305,9 @@ def solve_discrete_lyapunov(
         op = SolveBilinearDiscreteLyapunov(inputs=[A, Q], outputs=[X])
         return cast(TensorVariable, op(A, Q))
 
+    elif method == "smith":
+        return _smith_discrete_lyapunov(A, Q)
+
     else:
         raise ValueError(f"Unknown method {method}")
 
@@ -266,15 +318,16 @@ def _lop_solve_discrete_are(inputs, outputs, output_grads):
 
     Gradient computations come from Kao and Hennequin (2020), https://arxiv.org/pdf/2011.11430.pdf
     """
-    A, B, Q, R = inputs
+    A, B, _Q, R = inputs
 
     (dX,) = output_grads
-    X = solve_discrete_are(A, B, Q, R)
+    # Reuse the forward solution, instead of solving the Riccati equation again
+    (X,) = outputs
 
     K_inner = R + matrix_dot(B.T, X, B)
 
-    # K_inner is guaranteed to be symmetric, because X and R are symmetric
-    K_inner_inv_BT = solve(K_inner, B.T, assume_a="sym")
+    # K_inner is positive definite, because R is positive definite and X is positive semi-definite
+    K_inner_inv_BT = solve(K_inner, B.T, assume_a="pos")
     K = matrix_dot(K_inner_inv_BT, X, A)
 
     A_tilde = A - B.dot(K)
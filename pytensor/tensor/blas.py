@@ -116,20 +116,20 @@ _logger = logging.getLogger("pytensor.tensor.blas")
 def view_roots(node: Variable) -> list[Variable]:
     """Return the leaves from a search through consecutive view-maps."""
     owner = node.owner
-    if owner is not None:
-        try:
-            vars_to_views = {owner.outputs[o]: i for o, i in owner.op.view_map.items()}
-        except AttributeError:
-            return [node]
-        if node in vars_to_views:
-            answer = []
-            for i in vars_to_views[node]:
-                answer += view_roots(owner.inputs[i])
-            return answer
-        else:
-            return [node]
-    else:
+    if owner is None:
+        return [node]
+    try:
+        view_map = owner.op.view_map
+    except AttributeError:
+        return [node]
+    # Only look up the output we are interested in, instead of mapping all of them
+    view_of = view_map.get(node.index) if view_map else None
+    if view_of is None:
         return [node]
+    answer = []
+    for i in view_of:
+        answer += view_roots(owner.inputs[i])
+    return answer
 
 
 def must_initialize_y_gemv():
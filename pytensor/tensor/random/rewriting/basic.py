@@ -2,13 +2,13 @@ from itertools import chain
 
 from pytensor.compile import optdb
 from pytensor.configdefaults import config
-from pytensor.graph import ancestors
 from pytensor.graph.op import compute_test_value
 from pytensor.graph.rewriting.basic import (
     copy_stack_trace,
     dfs_rewriter,
     node_rewriter,
 )
+from pytensor.graph.traversal import ancestors_list
 from pytensor.tensor import TensorVariable
 from pytensor.tensor.basic import constant
 from pytensor.tensor.elemwise import DimShuffle
@@ -287,7 +287,9 @@ def local_subtensor_rv_lift(fgraph, node):
         # Use shape_feature to facilitate inferring final shape.
         # Check that neither the RV nor the old Subtensor are in the shape graph.
         output_shape = fgraph.shape_feature.shape_of.get(indexed_rv, None)
-        if output_shape is None or {indexed_rv, rv} & set(ancestors(output_shape)):
+        if output_shape is None or {indexed_rv, rv}.intersection(
+            ancestors_list(output_shape)
+        ):
             return None
 
         new_size = output_shape[: len(output_shape) - rv_op.ndim_supp]
@@ -11,18 +11,75 @@ T = TypeVar("T")
 
 
 gen_states_keys = {
-    "MT19937": (["state"], ["key", "pos"]),
-    "PCG64": (["state", "has_uint32", "uinteger"], ["state", "inc"]),
+    "MT19937": (("state",), ("key", "pos")),
+    "PCG64": (("state", "has_uint32", "uinteger"), ("state", "inc")),
     "Philox": (
-        ["state", "buffer", "buffer_pos", "has_uint32", "uinteger"],
-        ["counter", "key"],
+        ("state", "buffer", "buffer_pos", "has_uint32", "uinteger"),
+        ("counter", "key"),
     ),
-    "SFC64": (["state", "has_uint32", "uinteger"], ["state"]),
+    "SFC64": (("state", "has_uint32", "uinteger"), ("state",)),
 }
 
 # We map bit generators to an integer index so that we can avoid using strings
 numpy_bit_gens = {0: "MT19937", 1: "PCG64", 2: "Philox", 3: "SFC64"}
 
+# Same as `gen_states_keys`, as sets for fast validation, indexed by both the
+# bit generator names and their integer index
+_gen_states_key_sets: dict[str | int, tuple[frozenset[str], frozenset[str]]] = {
+    bit_gen: (frozenset(gen_keys), frozenset(state_keys))
+    for bit_gen, (gen_keys, state_keys) in gen_states_keys.items()
+}
+_gen_states_key_sets.update(
+    (idx, _gen_states_key_sets[bit_gen]) for idx, bit_gen in numpy_bit_gens.items()
+)
+
+
+def _array_keys(state: dict) -> frozenset[str]:
+    return frozenset(
+        key for key, value in state.items() if isinstance(value, np.ndarray)
+    )
+
+
+# Keys of the top-level and inner ``"state"`` dicts that hold arrays, for each bit generator
+gen_states_array_keys = {
+    bit_gen: (
+        _array_keys(state := getattr(np.random, bit_gen)().state),
+        _array_keys(state["state"]),
+    )
+    for bit_gen in gen_states_keys
+}
+
+
+def _arrays_eq(a, b) -> bool:
+    if (
+        type(a) is np.ndarray
+        and type(b) is np.ndarray
+        and a.dtype == b.dtype
+        and a.shape == b.shape
+    ):
+        # Comparing the raw bytes is much cheaper than `np.array_equal` for these small arrays
+        return a.tobytes() == b.tobytes()
+    return np.array_equal(a, b)
+
+
+def _states_eq(
+    sa: dict,
+    sb: dict,
+    array_keys: frozenset[str],
+    state_array_keys: frozenset[str] | None = None,
+) -> bool:
+    for key, value in sa.items():
+        other = sb[key]
+        if key in array_keys:
+            if not _arrays_eq(value, other):
+                return False
+        elif key == "state" and state_array_keys is not None:
+            if not _states_eq(value, other, state_array_keys):
+                return False
+        elif value != other:
+            return False
+    return True
+
 
 class RandomType(Type[T]):
     r"""A Type wrapper for `numpy.random.Generator."""
@@ -70,17 +127,11 @@ class RandomGeneratorType(RandomType[Generator]):
 
                 if hasattr(bit_gen_key, "_value"):
                     bit_gen_key = int(bit_gen_key._value)
-                    bit_gen_key = numpy_bit_gens[bit_gen_key]
 
-                gen_keys, state_keys = gen_states_keys[bit_gen_key]
+                gen_keys, state_keys = _gen_states_key_sets[bit_gen_key]
 
-                for key in gen_keys:
-                    if key not in data:
-                        raise TypeError()
-
-                for key in state_keys:
-                    if key not in data["state"]:
-                        raise TypeError()
+                if not (gen_keys.issubset(data) and state_keys.issubset(data["state"])):
+                    raise TypeError()
 
                 return data
 
@@ -88,9 +139,23 @@ class RandomGeneratorType(RandomType[Generator]):
 
     @staticmethod
     def values_eq(a, b):
+        if a is b:
+            return True
+        if (
+            isinstance(a, Generator)
+            and isinstance(b, Generator)
+            and a.bit_generator is b.bit_generator
+        ):
+            # Generators sharing a bit generator always have the same state
+            return True
+
         sa = a if isinstance(a, dict) else a.bit_generator.state
         sb = b if isinstance(b, dict) else b.bit_generator.state
 
+        if (array_keys := gen_states_array_keys.get(sa["bit_generator"])) is not None:
+            # Compare the state dicts using the known layout of this bit generator
+            return _states_eq(sa, sb, *array_keys)
+
         def _eq(sa, sb):
             for key in sa:
                 if isinstance(sa[key], dict):
@@ -239,6 +239,52 @@ def batched_vector_b_solve_to_matrix_b_solve(fgraph, node):
     return [new_solve]
 
 
+@register_specialize
+@node_rewriter([blockwise_of(OpPattern(SolveBase, b_ndim=2))])
+def batched_matrix_b_solve_to_matrix_b_solve(fgraph, node):
+    """Replace a batched Solve(a, b, b_ndim=2) by a single Solve(a, b_cols, b_ndim=2)
+
+    `a` must have no batched dimensions, while `b` can have arbitrary batched dimensions.
+    The columns of every batched `b` are stacked side by side, so that `a` is only factored once.
+    """
+    core_op = node.op.core_op
+    [a, b] = node.inputs
+
+    # Check `b` is actually batched
+    if b.type.ndim == 2:
+        return None
+
+    # These are split into a decomposition and triangular solves by `reuse_decomposition_multiple_solves`,
+    # which this rewrite then applies to
+    if isinstance(core_op, Solve) and core_op.assume_a in ("gen", "tridiagonal", "pos"):
+        return None
+
+    # Check `a` is a matrix (possibly with degenerate dims on the left)
+    a_bcast_batch_dims = a.type.broadcastable[:-2]
+    if not all(a_bcast_batch_dims):
+        return None
+    elif len(a_bcast_batch_dims):
+        a = a.squeeze(axis=tuple(range(len(a_bcast_batch_dims))))
+
+    # Move the core rows of `b` to the front, and ravel everything else into columns
+    batch_ndim = b.type.ndim - 2
+    *batch_shape, m, k = tuple(b.shape)
+    b_cols = b.dimshuffle(batch_ndim, *range(batch_ndim), batch_ndim + 1)
+    b_cols = b_cols.reshape((m, -1))
+
+    # Apply the rewrite
+    new_solve = Blockwise(core_op)(a, b_cols)
+
+    # Unravel the batched dims, and move the core rows back in place
+    new_solve = new_solve.reshape((m, *batch_shape, k))
+    new_solve = new_solve.dimshuffle(*range(1, batch_ndim + 1), 0, batch_ndim + 1)
+
+    old_solve = node.outputs[0]
+    copy_stack_trace(old_solve, new_solve)
+
+    return [new_solve]
+
+
 @register_canonicalize
 @register_stabilize
 @register_specialize
@@ -1,15 +1,15 @@
 import logging
 import warnings
-from collections.abc import Sequence
+from collections.abc import Callable, Sequence
 from functools import partial, reduce
 from typing import Literal, cast
 
 import numpy as np
 import scipy.linalg as scipy_linalg
-from scipy.linalg import get_lapack_funcs
+from scipy import __version__ as scipy_version
+from scipy.linalg import get_blas_funcs, get_lapack_funcs
 
 import pytensor
-from pytensor import ifelse
 from pytensor import tensor as pt
 from pytensor.gradient import DisconnectedType, disconnected_type
 from pytensor.graph.basic import Apply
@@ -27,6 +27,82 @@ from pytensor.utils import unzip
 
 logger = logging.getLogger(__name__)
 
+# scipy.linalg.solve only accepts assume_a="tridiagonal" and "banded" from 1.15
+_SCIPY_VERSION = tuple(int(v) for v in scipy_version.split(".")[:2])
+_SCIPY_HAS_STRUCTURED_SOLVE = _SCIPY_VERSION >= (1, 15)
+
+_blas_funcs_cache: dict[tuple, Callable] = {}
+_lapack_funcs_cache: dict[tuple, Callable] = {}
+_lapack_lwork_cache: dict[tuple, int | float] = {}
+
+
+def _get_lapack_func(name: str, arrays: tuple[np.ndarray, ...]) -> Callable:
+    """Return the LAPACK routine `name` for `arrays`, like `get_lapack_funcs`.
+
+    The routine only depends on the dtypes of the arrays, so the lookup is cached.
+    """
+    key = (name, *(a.dtype for a in arrays))
+    func = _lapack_funcs_cache.get(key)
+    if func is None:
+        (func,) = get_lapack_funcs((name,), arrays)
+        _lapack_funcs_cache[key] = func
+    return func
+
+
+def _get_blas_func(name: str, arrays: tuple[np.ndarray, ...]) -> Callable:
+    """Return the BLAS routine `name` for `arrays`, like `get_blas_funcs`.
+
+    The routine only depends on the dtypes of the arrays, so the lookup is cached.
+    """
+    key = (name, *(a.dtype for a in arrays))
+    func = _blas_funcs_cache.get(key)
+    if func is None:
+        (func,) = get_blas_funcs((name,), arrays)
+        _blas_funcs_cache[key] = func
+    return func
+
+
+def _lapack_out_dtype(name: str, *dtypes) -> np.dtype:
+    """Return the dtype that the LAPACK routine `name` computes in, for inputs of `dtypes`."""
+    func = _get_lapack_func(name, tuple(np.empty(0, dtype=dtype) for dtype in dtypes))
+    return np.dtype(func.dtype)  # type: ignore[attr-defined]
+
+
+def _solve_out_dtype(A_dtype, b_dtype) -> np.dtype:
+    """Return the dtype of ``scipy.linalg.solve(A, b)``, without calling it."""
+    if np.dtype(A_dtype).kind in "biu" and np.dtype(b_dtype).kind in "biu":
+        # Scipy converts integer and boolean inputs to float64
+        return np.dtype("float64")
+    return _lapack_out_dtype("gesv", A_dtype, b_dtype)
+
+
+def _batched_cholesky(x: np.ndarray, lower: bool) -> np.ndarray:
+    """Cholesky factor of a stack of matrices, with the semantics of `Cholesky.perform`.
+
+    The whole stack is factored by a single call to ``np.linalg.cholesky``. Matrices
+    that are not positive definite are filled with nan instead of raising.
+    """
+    if x.shape[-1] != x.shape[-2]:
+        raise ValueError(
+            f"Input array is expected to be square but has the shape: {x.shape[-2:]}."
+        )
+    x = x.astype(_lapack_out_dtype("potrf", x.dtype), copy=False)
+    try:
+        return np.linalg.cholesky(x, upper=not lower)
+    except np.linalg.LinAlgError:
+        # At least one matrix failed, factor them one at a time to find out which
+        out = np.empty_like(x)
+        for idx in np.ndindex(x.shape[:-2]):
+            try:
+                out[idx] = np.linalg.cholesky(x[idx], upper=not lower)
+            except np.linalg.LinAlgError:
+                out[idx] = np.nan
+        return out
+
+
+_batched_cholesky_lower = partial(_batched_cholesky, lower=True)
+_batched_cholesky_upper = partial(_batched_cholesky, lower=False)
+
 
 class Cholesky(Op):
     # TODO: LAPACK wrapper with in-place behavior, for solve also
@@ -45,6 +121,14 @@ class Cholesky(Op):
 
         if self.overwrite_a:
             self.destroy_map = {0: [0]}
+        else:
+            # Used by `Blockwise` to factor all the batched matrices in a single call.
+            # The inplace version keeps looping over `perform`, which writes into the input.
+            self.gufunc_spec = (
+                f"pytensor.tensor.slinalg._batched_cholesky_{'lower' if lower else 'upper'}",
+                1,
+                1,
+            )
 
     def infer_shape(self, fgraph, node, shapes):
         return [shapes[0]]
@@ -55,21 +139,21 @@ class Cholesky(Op):
             raise TypeError(
                 f"Cholesky only allowed on matrix (2-D) inputs, got {x.type.ndim}-D input"
             )
-        # Call scipy to find output dtype
-        dtype = scipy_linalg.cholesky(np.eye(1, dtype=x.type.dtype)).dtype
+        # The output dtype is the one of the LAPACK routine called in perform
+        dtype = _lapack_out_dtype("potrf", x.type.dtype)
         return Apply(self, [x], [tensor(shape=x.type.shape, dtype=dtype)])
 
     def perform(self, node, inputs, outputs):
         [x] = inputs
         [out] = outputs
 
-        (potrf,) = scipy_linalg.get_lapack_funcs(("potrf",), (x,))
-
         # Quick return for square empty array
         if x.size == 0:
-            out[0] = np.empty_like(x, dtype=potrf.dtype)
+            out[0] = np.empty_like(x, dtype=node.outputs[0].type.dtype)
             return
 
+        potrf = _get_lapack_func("potrf", (x,))
+
         # Squareness check
         if x.shape[0] != x.shape[1]:
             raise ValueError(
@@ -117,9 +201,16 @@ class Cholesky(Op):
             chol_x = chol_x.T
             dz = dz.T
 
+        # Masks of the lower triangle and the diagonal. Applying them with elementwise
+        # products, instead of `tril` and `diag(diagonal(.))`, lets the gradient fuse
+        # into a few elementwise operations
+        n = chol_x.shape[-1]
+        lower_mask = ptb.tri(n, dtype=chol_x.dtype)
+        diag_mask = ptb.eye(n, dtype=chol_x.dtype)
+
         def tril_and_halve_diagonal(mtx):
             """Extracts lower triangle of square matrix and halves diagonal."""
-            return ptb.tril(mtx) - ptb.diag(ptb.diagonal(mtx) / 2.0)
+            return mtx * (lower_mask - diag_mask / 2)
 
         def conjugate_solve_triangular(outer, inner):
             """Computes L^{-T} P L^{-1} for lower-triangular L."""
@@ -131,9 +222,9 @@ class Cholesky(Op):
         )
 
         if self.lower:
-            grad = ptb.tril(s + s.T) - ptb.diag(ptb.diagonal(s))
+            grad = (s + s.T) * lower_mask - s * diag_mask
         else:
-            grad = ptb.triu(s + s.T) - ptb.diag(ptb.diagonal(s))
+            grad = (s + s.T) * lower_mask.T - s * diag_mask
 
         return [grad]
 
@@ -265,11 +356,7 @@ class SolveBase(Op):
         if b.ndim != self.b_ndim:
             raise ValueError(f"`b` must have {self.b_ndim} dims; got {b.type} instead.")
 
-        # Infer dtype by solving the most simple case with 1x1 matrices
-        o_dtype = scipy_linalg.solve(
-            np.ones((1, 1), dtype=A.dtype),
-            np.ones((1,), dtype=b.dtype),
-        ).dtype
+        o_dtype = _solve_out_dtype(A.dtype, b.dtype)
         x = tensor(dtype=o_dtype, shape=b.type.shape)
         return Apply(self, [A, b], [x])
 
@@ -308,8 +395,9 @@ class SolveBase(Op):
         solve_op = type(self)(**props_dict)
 
         b_bar = solve_op(A.mT, c_bar)
-        # force outer product if vector second input
-        A_bar = -ptm.outer(b_bar, c) if c.ndim == 1 else -b_bar.dot(c.T)
+        # force outer product if vector second input.
+        # The outer product already becomes a BLAS ger, so negate the smaller operand instead of the product
+        A_bar = ptm.outer(-b_bar, c) if c.ndim == 1 else (-b_bar).dot(c.T)
 
         if props_dict.get("unit_diagonal", False):
             n = A_bar.shape[-1]
@@ -345,19 +433,15 @@ class CholeskySolve(SolveBase):
         super_apply = super().make_node(*inputs)
         A, b = super_apply.inputs
         [super_out] = super_apply.outputs
-        # The dtype of chol_solve does not match solve, which the base class checks
-        dtype = scipy_linalg.cho_solve(
-            (np.ones((1, 1), dtype=A.dtype), False),
-            np.ones((1,), dtype=b.dtype),
-        ).dtype
+        # The dtype of chol_solve does not match solve, which the base class checks.
+        # It is the one of the LAPACK routine called in perform
+        dtype = _lapack_out_dtype("potrs", A.dtype, b.dtype)
         out = tensor(dtype=dtype, shape=super_out.type.shape)
         return Apply(self, [A, b], [out])
 
     def perform(self, node, inputs, output_storage):
         c, b = inputs
 
-        (potrs,) = get_lapack_funcs(("potrs",), (c, b))
-
         if c.shape[0] != c.shape[1]:
             raise ValueError("The factored matrix c is not square.")
         if c.shape[1] != b.shape[0]:
@@ -365,9 +449,11 @@ class CholeskySolve(SolveBase):
 
         # Quick return for empty arrays
         if b.size == 0:
-            output_storage[0][0] = np.empty_like(b, dtype=potrs.dtype)
+            output_storage[0][0] = np.empty_like(b, dtype=node.outputs[0].type.dtype)
             return
 
+        potrs = _get_lapack_func("potrs", (c, b))
+
         x, info = potrs(c, b, lower=self.lower, overwrite_b=self.overwrite_b)
         if info != 0:
             x[...] = np.nan
@@ -450,6 +536,11 @@ class LU(Op):
             raise TypeError(
                 f"LU only allowed on matrix (2-D) inputs, got {x.type.ndim}-D input"
             )
+        M, N = x.type.shape
+        if M is not None and N is not None and M != N:
+            raise ValueError(
+                f"LU only allowed on square matrices, got input with shape {x.type.shape}"
+            )
 
         if x.type.numpy_dtype.kind in "ibu":
             if x.type.numpy_dtype.itemsize <= 2:
@@ -478,20 +569,41 @@ class LU(Op):
 
     def perform(self, node, inputs, outputs):
         [A] = inputs
+        n, m = A.shape
+        if n != m:
+            raise ValueError(
+                f"LU only allowed on square matrices, got input with shape {A.shape}"
+            )
 
-        out = scipy_linalg.lu(
-            A,
-            permute_l=self.permute_l,
-            overwrite_a=self.overwrite_a,
-            p_indices=self.p_indices,
-        )
+        # Quick return for empty arrays
+        if A.size == 0:
+            for out, var in zip(outputs, node.outputs):
+                out[0] = np.empty((0,) * var.type.ndim, dtype=var.type.dtype)
+            return
+
+        # Call getrf directly and only build the permutation output that was requested,
+        # instead of letting `scipy.linalg.lu` assemble all of them
+        getrf = _get_lapack_func("getrf", (A,))
+        LU, piv, _info = getrf(A, overwrite_a=self.overwrite_a)
+
+        L = np.tril(LU, k=-1)
+        np.fill_diagonal(L, 1)
+        U = np.triu(LU)
 
-        outputs[0][0] = out[0]
-        outputs[1][0] = out[1]
+        if self.permute_l:
+            # P @ L is a row gather of L
+            outputs[0][0] = L[_pivots_to_permutation(piv, inverse=False)]
+            outputs[1][0] = U
+            return
 
-        if not self.permute_l:
-            # In all cases except permute_l, there are three returns
-            outputs[2][0] = out[2]
+        if self.p_indices:
+            outputs[0][0] = _pivots_to_permutation(piv, inverse=False)
+        else:
+            P = np.zeros((n, n), dtype=node.outputs[0].type.dtype)
+            P[_pivots_to_permutation(piv, inverse=True), np.arange(n)] = 1
+            outputs[0][0] = P
+        outputs[1][0] = L
+        outputs[2][0] = U
 
     def inplace_on_inputs(self, allowed_inplace_inputs: list[int]) -> "Op":
         if 0 in allowed_inplace_inputs:
@@ -603,6 +715,26 @@ def lu(
     )
 
 
+def _pivots_to_permutation(pivots: np.ndarray, inverse: bool) -> np.ndarray:
+    """Convert the row swaps returned by ``getrf`` into a permutation of row indices."""
+    n = len(pivots)
+
+    # The swaps are sequential, so they can't be vectorized.
+    # Python lists are much faster than numpy arrays for this scalar loop
+    p_inv_list = list(range(n))
+    for i, pivot in enumerate(pivots.tolist()):
+        p_inv_list[i], p_inv_list[pivot] = p_inv_list[pivot], p_inv_list[i]
+    p_inv = np.array(p_inv_list, dtype="int32")
+
+    if inverse:
+        return p_inv
+
+    # Invert the permutation directly, instead of sorting it
+    p = np.empty_like(p_inv)
+    p[p_inv] = np.arange(n, dtype="int32")
+    return p
+
+
 class PivotToPermutations(Op):
     gufunc_signature = "(x)->(x)"
     __props__ = ("inverse",)
@@ -615,20 +747,13 @@ class PivotToPermutations(Op):
         if pivots.ndim != 1:
             raise ValueError("PivotToPermutations only works on 1-D inputs")
 
-        permutations = pivots.type.clone(dtype="int64")()
+        # LAPACK pivots are int32, so the permutation always fits in int32 as well
+        permutations = pivots.type.clone(dtype="int32")()
         return Apply(self, [pivots], [permutations])
 
     def perform(self, node, inputs, outputs):
         [pivots] = inputs
-        p_inv = np.arange(len(pivots), dtype="int64")
-
-        for i in range(len(pivots)):
-            p_inv[i], p_inv[pivots[i]] = p_inv[pivots[i]], p_inv[i]
-
-        if self.inverse:
-            outputs[0][0] = p_inv
-        else:
-            outputs[0][0] = np.argsort(p_inv)
+        outputs[0][0] = _pivots_to_permutation(pivots, inverse=self.inverse)
 
 
 def pivot_to_permutation(p: TensorLike, inverse=False):
@@ -679,7 +804,7 @@ class LUFactor(Op):
             outputs[1][0] = np.array([], dtype=np.int32)
             return
 
-        (getrf,) = get_lapack_funcs(("getrf",), (A,))
+        getrf = _get_lapack_func("getrf", (A,))
         LU, p, info = getrf(A, overwrite_a=self.overwrite_a)
         if info != 0:
             LU[...] = np.nan
@@ -688,13 +813,12 @@ class LUFactor(Op):
         outputs[1][0] = p
 
     def L_op(self, inputs, outputs, output_gradients):
-        [A] = inputs
         LU_bar, _ = output_gradients
         LU, p_indices = outputs
 
-        eye = ptb.identity_like(A)
-        L = cast(TensorVariable, ptb.tril(LU, k=-1) + eye)
-        U = cast(TensorVariable, ptb.triu(LU))
+        # L has an implicit unit diagonal, which is never materialized
+        L_strict = ptb.tril(LU, k=-1)
+        U = ptb.triu(LU)
 
         p_indices = pivot_to_permutation(p_indices, inverse=False)
 
@@ -702,12 +826,16 @@ class LUFactor(Op):
         L_bar = ptb.tril(LU_bar, k=-1)
         U_bar = ptb.triu(LU_bar)
 
-        # From here we're in the same situation as the LU gradient derivation
-        x1 = ptb.tril(L.T @ L_bar, k=-1)
+        # From here we're in the same situation as the LU gradient derivation.
+        # With L = L_strict + I and L_bar strictly lower, tril(L.T @ L_bar, k=-1) = tril(L_strict.T @ L_bar, k=-1) + L_bar
+        x1 = ptb.tril(L_strict.T @ L_bar, k=-1) + L_bar
         x2 = ptb.triu(U_bar @ U.T)
 
-        LT_inv_x = solve_triangular(L.T, x1 + x2, lower=False, unit_diagonal=True)
-        B_bar = solve_triangular(U, LT_inv_x.T, lower=False).T
+        # The triangular solves only read the relevant triangle, so they can use the packed LU directly
+        LT_inv_x = solve_triangular(
+            LU, x1 + x2, trans=1, lower=True, unit_diagonal=True
+        )
+        B_bar = solve_triangular(LU, LT_inv_x.T, lower=False).T
         A_bar = B_bar[p_indices]
 
         return [A_bar]
@@ -746,18 +874,16 @@ def lu_factor(
 
 
 def _lu_solve(
-    LU: TensorLike,
-    pivots: TensorLike,
-    b: TensorLike,
+    LU: TensorVariable,
+    pivots: TensorVariable,
+    b: TensorVariable,
     trans: bool = False,
     b_ndim: int | None = None,
 ):
+    # Inputs are the core variables created by `pt.vectorize` in `lu_solve`
     b_ndim = _default_b_ndim(b, b_ndim)
 
-    LU, pivots, b = map(pt.as_tensor_variable, [LU, pivots, b])
-
-    inv_permutation = pivot_to_permutation(pivots, inverse=True)
-    x = b[inv_permutation] if not trans else b
+    x = b[pivot_to_permutation(pivots, inverse=True)] if not trans else b
     # TODO: Use PermuteRows on b
     # x = permute_rows(b, pivots) if not trans else b
 
@@ -782,7 +908,8 @@ def _lu_solve(
     # TODO: Use PermuteRows(inverse=True) on x
     # if trans:
     #     x = permute_rows(x, pivots, inverse=True)
-    x = x[pt.argsort(inv_permutation)] if trans else x
+    # The forward permutation is computed directly, instead of sorting the inverse one
+    x = x[pivot_to_permutation(pivots, inverse=False)] if trans else x
     return x
 
 
@@ -813,13 +940,15 @@ def lu_solve(
     overwrite_b: bool
         Ignored by Pytensor. Pytensor will always compute inplace when possible.
     """
+    LU, pivots = map(as_tensor_variable, LU_and_pivots)
+    b = as_tensor_variable(b)
     b_ndim = _default_b_ndim(b, b_ndim)
     if b_ndim == 1:
         signature = "(m,m),(m),(m)->(m)"
     else:
         signature = "(m,m),(m),(m,n)->(m,n)"
     partialled_func = partial(_lu_solve, trans=trans, b_ndim=b_ndim)
-    return pt.vectorize(partialled_func, signature=signature)(*LU_and_pivots, b)
+    return pt.vectorize(partialled_func, signature=signature)(LU, pivots, b)
 
 
 class SolveTriangular(SolveBase):
@@ -850,13 +979,13 @@ class SolveTriangular(SolveBase):
         if A.shape[0] != b.shape[0]:
             raise ValueError(f"shapes of a {A.shape} and b {b.shape} are incompatible")
 
-        (trtrs,) = get_lapack_funcs(("trtrs",), (A, b))
-
         # Quick return for empty arrays
         if b.size == 0:
-            outputs[0][0] = np.empty_like(b, dtype=trtrs.dtype)
+            outputs[0][0] = np.empty_like(b, dtype=node.outputs[0].type.dtype)
             return
 
+        trtrs = _get_lapack_func("trtrs", (A, b))
+
         if A.flags["F_CONTIGUOUS"]:
             x, info = trtrs(
                 A,
@@ -954,6 +1083,41 @@ def solve_triangular(
     return cast(TensorVariable, ret)
 
 
+def _batched_solve(a: np.ndarray, b: np.ndarray, b_ndim: int) -> np.ndarray:
+    """Solve a stack of general linear systems, with the semantics of `Solve.perform`.
+
+    All systems are solved by a single call to ``np.linalg.solve``, which loops over
+    the batch dimensions in C. Singular systems are filled with nan instead of raising.
+    """
+    if a.shape[-1] != a.shape[-2]:
+        raise ValueError("expected square matrix")
+    out_dtype = _solve_out_dtype(a.dtype, b.dtype)
+    a = a.astype(out_dtype, copy=False)
+    b = b.astype(out_dtype, copy=False)
+    if b_ndim == 1:
+        b = b[..., None]
+    try:
+        x = np.linalg.solve(a, b)
+    except np.linalg.LinAlgError:
+        # At least one system is singular, solve them one at a time to find out which
+        batch_shape = np.broadcast_shapes(a.shape[:-2], b.shape[:-2])
+        a = np.broadcast_to(a, batch_shape + a.shape[-2:])
+        b = np.broadcast_to(b, batch_shape + b.shape[-2:])
+        x = np.empty(b.shape, dtype=out_dtype)
+        for idx in np.ndindex(x.shape[:-2]):
+            try:
+                x[idx] = np.linalg.solve(a[idx], b[idx])
+            except np.linalg.LinAlgError:
+                x[idx] = np.nan
+    if b_ndim == 1:
+        x = x[..., 0]
+    return x
+
+
+_batched_solve_vector = partial(_batched_solve, b_ndim=1)
+_batched_solve_matrix = partial(_batched_solve, b_ndim=2)
+
+
 class Solve(SolveBase):
     """
     Solve a system of linear equations.
@@ -986,21 +1150,63 @@ class Solve(SolveBase):
                 f"Invalid assume_a: {assume_a}. It must be one of {valid_options} or {list(long_to_short.keys())}"
             )
 
-        if assume_a in ("tridiagonal", "banded"):
-            from scipy import __version__ as sp_version
-
-            if tuple(map(int, sp_version.split(".")[:-1])) < (1, 15):
-                warnings.warn(
-                    f"assume_a={assume_a} requires scipy>=1.5.0. Defaulting to assume_a='gen'.",
-                    UserWarning,
-                )
-                assume_a = "gen"
+        if assume_a in ("tridiagonal", "banded") and not _SCIPY_HAS_STRUCTURED_SOLVE:
+            warnings.warn(
+                f"assume_a={assume_a} requires scipy>=1.15.0. Defaulting to assume_a='gen'.",
+                UserWarning,
+            )
+            assume_a = "gen"
 
         super().__init__(**kwargs)
         self.assume_a = assume_a
 
+        if assume_a == "gen" and not (self.overwrite_a or self.overwrite_b):
+            # Used by `Blockwise` to solve all the batched systems in a single call,
+            # instead of paying the LAPACK dispatch overhead once per batch entry.
+            # The inplace versions keep looping over `perform`, which writes into the inputs.
+            self.gufunc_spec = (
+                f"pytensor.tensor.slinalg._batched_solve_{'vector' if self.b_ndim == 1 else 'matrix'}",
+                2,
+                1,
+            )
+
     def perform(self, node, inputs, outputs):
         a, b = inputs
+
+        # Quick return for empty arrays. Invalid shapes are left for scipy to report
+        if b.size == 0 and a.shape == (b.shape[0], b.shape[0]):
+            outputs[0][0] = np.empty_like(b, dtype=node.outputs[0].type.dtype)
+            return
+
+        if self.assume_a in ("gen", "pos"):
+            # Call the LAPACK driver directly, scipy.linalg.solve validation dominates for small matrices
+            if a.ndim != 2 or a.shape[0] != a.shape[1]:
+                raise ValueError("expected square matrix")
+            if a.shape[0] != b.shape[0]:
+                raise ValueError(
+                    f"shapes of a {a.shape} and b {b.shape} are incompatible"
+                )
+
+            if self.assume_a == "gen":
+                gesv = _get_lapack_func("gesv", (a, b))
+                _lu, _piv, x, info = gesv(
+                    a, b, overwrite_a=self.overwrite_a, overwrite_b=self.overwrite_b
+                )
+            else:
+                posv = _get_lapack_func("posv", (a, b))
+                _c, x, info = posv(
+                    a,
+                    b,
+                    lower=self.lower,
+                    overwrite_a=self.overwrite_a,
+                    overwrite_b=self.overwrite_b,
+                )
+
+            if info != 0:
+                x[...] = np.nan
+            outputs[0][0] = x
+            return
+
         try:
             outputs[0][0] = scipy_linalg.solve(
                 a=a,
@@ -1012,7 +1218,7 @@ class Solve(SolveBase):
                 overwrite_b=self.overwrite_b,
             )
         except np.linalg.LinAlgError:
-            outputs[0][0] = np.full(a.shape, np.nan, dtype=a.dtype)
+            outputs[0][0] = np.full(b.shape, np.nan, dtype=node.outputs[0].type.dtype)
 
     def inplace_on_inputs(self, allowed_inplace_inputs: list[int]) -> "Op":
         if not allowed_inplace_inputs:
@@ -1109,12 +1315,12 @@ def solve(
     b_ndim = _default_b_ndim(b, b_ndim)
 
     if assume_a == "diagonal":
+        # A single broadcasted division, each row of b is scaled by the matching diagonal entry
         a_diagonal = diagonal(a, axis1=-2, axis2=-1)
-        b_transposed = b[None, :] if b_ndim == 1 else b.mT
-        x = (b_transposed / pt.expand_dims(a_diagonal, -2)).mT
+        b = as_tensor_variable(b)
         if b_ndim == 1:
-            x = x.squeeze(-1)
-        return x
+            return b / a_diagonal
+        return b / pt.expand_dims(a_diagonal, -1)
 
     if transposed:
         a = a.mT
@@ -1176,6 +1382,29 @@ class Eigvalsh(Op):
         return [(n,)]
 
 
+def _fold_weighted_gram(v, d, lower):
+    """Fold the symmetric ``G = v @ diag(d) @ v.T`` onto its ``lower`` (or upper) triangle.
+
+    ``G`` is built from two rank-k ``syrk`` updates, one for the positive and one
+    for the negative entries of ``d``, which only fill the ``lower`` (or upper)
+    triangle and take half the flops of the equivalent ``gemm``. Folding the
+    other triangle onto it then amounts to doubling the off-diagonal entries.
+    """
+    if v.size == 0:
+        return np.zeros(v.shape, dtype=np.result_type(v, d))
+    pos = d > 0
+    # nan weights go with the negative ones, so that they propagate to G like in the gemm
+    neg = ~pos
+    v_pos = v[:, pos] * np.sqrt(d[pos])
+    v_neg = v[:, neg] * np.sqrt(-d[neg])
+    syrk = _get_blas_func("syrk", (v_pos, v_neg))
+    G = syrk(1.0, v_pos, lower=lower)
+    G = syrk(-1.0, v_neg, beta=1.0, c=G, lower=lower, overwrite_c=True)
+    out = 2 * G
+    np.fill_diagonal(out, np.diagonal(G))
+    return out
+
+
 class EigvalshGrad(Op):
     """
     Gradient of generalized eigenvalues of a Hermitian positive definite
@@ -1196,12 +1425,6 @@ class EigvalshGrad(Op):
     def __init__(self, lower=True):
         assert lower in [True, False]
         self.lower = lower
-        if lower:
-            self.tri0 = np.tril
-            self.tri1 = lambda a: np.triu(a, 1)
-        else:
-            self.tri0 = np.triu
-            self.tri1 = lambda a: np.tril(a, -1)
 
     def make_node(self, a, b, gw):
         a = as_tensor_variable(a)
@@ -1219,12 +1442,11 @@ class EigvalshGrad(Op):
     def perform(self, node, inputs, outputs):
         (a, b, gw) = inputs
         w, v = scipy_linalg.eigh(a, b, lower=self.lower)
-        gA = v.dot(np.diag(gw).dot(v.T))
-        gB = -v.dot(np.diag(gw * w).dot(v.T))
-
-        # See EighGrad comments for an explanation of these lines
-        out1 = self.tri0(gA) + self.tri1(gA).T
-        out2 = self.tri0(gB) + self.tri1(gB).T
+        # gA = v @ diag(gw) @ v.T and gB = -v @ diag(gw * w) @ v.T are symmetric,
+        # so only the triangle selected by `lower` needs to be computed
+        # (see EighGrad comments for why the other triangle is folded onto it).
+        out1 = _fold_weighted_gram(v, gw, self.lower)
+        out2 = _fold_weighted_gram(v, -(gw * w), self.lower)
         outputs[0][0] = np.asarray(out1, dtype=node.outputs[0].dtype)
         outputs[1][0] = np.asarray(out2, dtype=node.outputs[1].dtype)
 
@@ -1360,7 +1582,18 @@ class BlockDiagonal(BaseBlockDiagonal):
 
     def perform(self, node, inputs, output_storage, params=None):
         dtype = node.outputs[0].type.dtype
-        output_storage[0][0] = scipy_linalg.block_diag(*inputs).astype(dtype)
+        n_rows = sum(m.shape[0] for m in inputs)
+        n_cols = sum(m.shape[1] for m in inputs)
+
+        # Write each block directly into the output, which already has the right dtype
+        out = np.zeros((n_rows, n_cols), dtype=dtype)
+        r = c = 0
+        for m in inputs:
+            h, w = m.shape
+            out[r : r + h, c : c + w] = m
+            r += h
+            c += w
+        output_storage[0][0] = out
 
 
 def block_diag(*matrices: TensorVariable):
@@ -1410,6 +1643,21 @@ def block_diag(*matrices: TensorVariable):
     return _block_diagonal_matrix(*matrices)
 
 
+def _batched_qr(x: np.ndarray, mode: str) -> tuple[np.ndarray, np.ndarray]:
+    """QR decomposition of a stack of matrices, with the semantics of `QR.perform`.
+
+    The whole stack is factored by a single call to ``np.linalg.qr``, which runs the same
+    LAPACK routines as scipy in a loop over the batch dimensions.
+    """
+    x = x.astype(_lapack_out_dtype("geqrf", x.dtype), copy=False)
+    Q, R = np.linalg.qr(x, mode="complete" if mode == "full" else "reduced")
+    return Q, R
+
+
+_batched_qr_full = partial(_batched_qr, mode="full")
+_batched_qr_economic = partial(_batched_qr, mode="economic")
+
+
 class QR(Op):
     """
     QR Decomposition
@@ -1452,6 +1700,13 @@ class QR(Op):
 
         if pivoting:
             self.gufunc_signature += ",(n)"
+        elif mode in ("full", "economic") and not overwrite_a:
+            # Used by `Blockwise` to factor all the batched matrices in a single call
+            self.gufunc_spec = (
+                f"pytensor.tensor.slinalg._batched_qr_{mode}",
+                1,
+                2,
+            )
 
     def make_node(self, x):
         x = as_tensor_variable(x)
@@ -1543,8 +1798,13 @@ class QR(Op):
 
     def _call_and_get_lwork(self, fn, *args, lwork, **kwargs):
         if lwork in [-1, None]:
-            *_, work, _info = fn(*args, lwork=-1, **kwargs)
-            lwork = work.item()
+            # The optimal workspace only depends on the routine and the shapes of its arguments,
+            # so the workspace query is only done once per shape
+            key = (fn, *(np.shape(arg) for arg in args))
+            lwork = _lapack_lwork_cache.get(key)
+            if lwork is None:
+                *_, work, _info = fn(*args, lwork=-1, **kwargs)
+                lwork = _lapack_lwork_cache[key] = work.item()
 
         return fn(*args, lwork=lwork, **kwargs)
 
@@ -1553,18 +1813,27 @@ class QR(Op):
         M, N = x.shape
 
         if self.pivoting:
-            (geqp3,) = get_lapack_funcs(("geqp3",), (x,))
+            geqp3 = _get_lapack_func("geqp3", (x,))
             qr, jpvt, tau, *_work_info = self._call_and_get_lwork(
                 geqp3, x, lwork=-1, overwrite_a=self.overwrite_a
             )
             jpvt -= 1  # geqp3 returns a 1-based index array, so subtract 1
         else:
-            (geqrf,) = get_lapack_funcs(("geqrf",), (x,))
+            geqrf = _get_lapack_func("geqrf", (x,))
             qr, tau, *_work_info = self._call_and_get_lwork(
                 geqrf, x, lwork=-1, overwrite_a=self.overwrite_a
             )
 
-        if self.mode not in ["economic", "raw"] or M < N:
+        if self.mode == "r":
+            # qr is not needed after R is extracted, so zero its strictly lower triangle in place
+            # instead of copying it
+            R = qr
+            R[np.tri(M, N, k=-1, dtype=bool)] = 0
+        elif self.mode == "full" and M >= N and not self.overwrite_a:
+            # Same as above, but only after qr has been copied into the buffer used to build Q.
+            # With overwrite_a, qr may be the input, which must not be returned as R
+            R = None
+        elif self.mode not in ["economic", "raw"] or M < N:
             R = np.triu(qr)
         else:
             R = np.triu(qr[:N, :])
@@ -1591,7 +1860,7 @@ class QR(Op):
             outputs[2][0] = R
             return
 
-        (gor_un_gqr,) = get_lapack_funcs(("orgqr",), (qr,))
+        gor_un_gqr = _get_lapack_func("orgqr", (qr,))
 
         if M < N:
             Q, _work, _info = self._call_and_get_lwork(
@@ -1603,8 +1872,12 @@ class QR(Op):
             )
         else:
             t = qr.dtype.char
-            qqr = np.empty((M, M), dtype=t)
+            # Fortran order, so that orgqr really works in place instead of copying the whole buffer again
+            qqr = np.empty((M, M), dtype=t, order="F")
             qqr[:, :N] = qr
+            if R is None:
+                R = qr
+                R[np.tri(M, N, k=-1, dtype=bool)] = 0
 
             # Always overwite qqr -- it's a meaningless intermediate value
             Q, _work, _info = self._call_and_get_lwork(
@@ -1632,7 +1905,7 @@ class QR(Op):
         (A,) = (cast(ptb.TensorVariable, x) for x in inputs)
         m, n = A.shape
 
-        # Check if we have static shape info, if so we can get a better graph (avoiding the ifelse Op in the output)
+        # Check if we have static shape info, if so we can get a simpler graph when m >= n
         M_static, N_static = A.type.shape
         shapes_unknown = M_static is None or N_static is None
 
@@ -1690,31 +1963,22 @@ class QR(Op):
 
             (dQ, dR) = (cast(ptb.TensorVariable, x) for x in new_output_grads)
 
-        if shapes_unknown or M_static >= N_static:
+        if not shapes_unknown and M_static >= N_static:
             # gradient expression when m >= n
             M = R @ _H(dR) - _H(dQ) @ Q
             K = dQ + Q @ _copyltu(M)
-            A_bar_m_ge_n = _H(solve_triangular(R, _H(K)))
-
-            if not shapes_unknown:
-                return [A_bar_m_ge_n]
-
-        # We have to trigger both branches if shapes_unknown is True, so this is purposefully not an elif branch
-        if shapes_unknown or M_static < N_static:
-            # gradient expression when m < n
-            Y = A[:, m:]
-            U = R[:, :m]
-            dU, dV = dR[:, :m], dR[:, m:]
-            dQ_Yt_dV = dQ + Y @ _H(dV)
-            M = U @ _H(dU) - _H(dQ_Yt_dV) @ Q
-            X_bar = _H(solve_triangular(U, _H(dQ_Yt_dV + Q @ _copyltu(M))))
-            Y_bar = Q @ dV
-            A_bar_m_lt_n = pt.concatenate([X_bar, Y_bar], axis=1)
-
-            if not shapes_unknown:
-                return [A_bar_m_lt_n]
-
-        return [ifelse(ptm.ge(m, n), A_bar_m_ge_n, A_bar_m_lt_n)]
+            return [_H(solve_triangular(R, _H(K)))]
+
+        # gradient expression when m < n. It also holds when m >= n, in which case Y, dV and Y_bar are empty
+        # and it reduces to the expression above, so a single graph covers unknown shapes
+        Y = A[:, m:]
+        U = R[:, :m]
+        dU, dV = dR[:, :m], dR[:, m:]
+        dQ_Yt_dV = dQ + Y @ _H(dV)
+        M = U @ _H(dU) - _H(dQ_Yt_dV) @ Q
+        X_bar = _H(solve_triangular(U, _H(dQ_Yt_dV + Q @ _copyltu(M))))
+        Y_bar = Q @ dV
+        return [pt.concatenate([X_bar, Y_bar], axis=1)]
 
 
 def qr(
@@ -168,7 +168,7 @@ class TensorType(CType[np.ndarray], HasDataType, HasShape):
         """
         # Explicit error message when one accidentally uses a Variable as
         # input (typical mistake, especially with shared variables).
-        if isinstance(data, Variable):
+        if not isinstance(data, np.ndarray) and isinstance(data, Variable):
             raise TypeError(
                 "Expected an array-like object, but found a Variable: "
                 "maybe you are trying to call a function on a (possibly "
@@ -271,13 +271,11 @@ class TensorType(CType[np.ndarray], HasDataType, HasShape):
             )
 
         # zip strict not specified because we are in a hot loop
-        if not all(
-            ds == ts if ts is not None else True
-            for ds, ts in zip(data.shape, self.shape)
-        ):
-            raise TypeError(
-                f"The type's shape ({self.shape}) is not compatible with the data's ({data.shape})"
-            )
+        for ds, ts in zip(data.shape, self.shape):
+            if ts is not None and ds != ts:
+                raise TypeError(
+                    f"The type's shape ({self.shape}) is not compatible with the data's ({data.shape})"
+                )
 
         if self.filter_checks_isfinite and not np.all(np.isfinite(data)):
             raise ValueError("Non-finite elements not allowed")
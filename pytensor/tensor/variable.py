@@ -949,6 +949,10 @@ class TensorConstantSignature(tuple):
         if t0 != t1 or d0.shape != d1.shape:
             return False
 
+        if d0 is d1:
+            # Constants sharing the same data (e.g. clones) are equal
+            return True
+
         self.no_nan  # Ensure has_nan is computed.
         # Note that in the comparisons below, the elementwise comparisons
         # come last because they are the most expensive checks.
@@ -1,4 +1,5 @@
 import pickle
+import weakref
 from itertools import count
 
 import numpy as np
@@ -99,6 +100,14 @@ class TestStr(X):
         s = self.str([r1, r2, r5], node2.outputs)
         assert s == ["MyOp(MyOp(R1, R2), R5)"]
 
+    def test_as_string_no_recursion_limit(self):
+        r1, r2 = MyVariable(1), MyVariable(2)
+        out = r1
+        for _ in range(5000):
+            out = MyOp.make_node(out, r2).outputs[0]
+        (s,) = self.str([r1, r2], [out])
+        assert s == "MyOp(" * 5000 + "R1" + ", R2)" * 5000
+
     def test_multiple_references(self):
         r1, r2, r5 = MyVariable(1), MyVariable(2), MyVariable(5)
         node = MyOp.make_node(r1, r2)
@@ -204,11 +213,18 @@ class TestEval:
     def test_eval(self):
         assert self.w.eval({self.x: 1.0, self.y: 2.0}) == 6.0
         assert self.w.eval({self.z: 3}) == 6.0
-        assert hasattr(self.w, "_fn_cache"), "variable must have cache after eval"
-        assert not hasattr(pickle.loads(pickle.dumps(self.w)), "_fn_cache"), (
+        assert self.w._fn_cache, "variable must have cache after eval"
+        assert pickle.loads(pickle.dumps(self.w))._fn_cache is None, (
             "temporary functions must not be serialized"
         )
 
+    def test_eval_inputs_order(self):
+        w = self.x - self.y
+        assert w.eval({self.x: 1.0, self.y: 2.0}) == -1.0
+        # The compiled function is reused regardless of the order of the inputs
+        assert w.eval({self.y: 2.0, self.x: 1.0}) == -1.0
+        assert len(w._fn_cache) == 1
+
     def test_eval_with_strings(self):
         assert self.w.eval({"x": 1.0, self.y: 2.0}) == 6.0
         assert self.w.eval({self.z: 3}) == 6.0
@@ -328,6 +344,18 @@ def test_equal_computations():
     assert equal_computations(max_argmax1, max_argmax2)
 
 
+def test_equal_computations_deep_graph():
+    # Graphs deeper than the recursion limit can be compared
+    a, b = iscalars(2)
+    x = y = z = a
+    for i in range(5000):
+        x = x + i
+        y = y + i
+        z = z + (i if i != 0 else b)
+    assert equal_computations([x], [y])
+    assert not equal_computations([x], [z])
+
+
 def test_ops():
     r1, r2, r3, r4 = MyVariable(1), MyVariable(2), MyVariable(3), MyVariable(4)
     o1 = MyOp(r1, r2)
@@ -342,6 +370,29 @@ def test_ops():
     assert res_list == [o3.owner, o2.owner, o1.owner]
 
 
+def test_apply_pickle():
+    x = vector("x")
+    node = (x + 1).owner
+    node.tag.ufunc = np.add
+    assert not hasattr(node, "__dict__")
+
+    node_unpkld = pickle.loads(pickle.dumps(node))
+    assert node_unpkld.op == node.op
+    assert len(node_unpkld.inputs) == len(node.inputs)
+    assert node_unpkld.outputs[0].owner is node_unpkld
+    assert not hasattr(node_unpkld.tag, "ufunc")
+    # The original tag is left untouched
+    assert node.tag.ufunc is np.add
+
+
+def test_apply_weakref():
+    node = (vector("x") + 1).owner
+    ref = weakref.ref(node)
+    assert ref() is node
+    cache = weakref.WeakKeyDictionary({node: 1})
+    assert cache[node] == 1
+
+
 def test_clone_new_inputs():
     """Make sure that `Apply.clone_with_new_inputs` properly handles `Type` changes."""
 
@@ -458,6 +509,11 @@ def test_NominalVariable_create_variable_type():
     assert ntv2.equals(ntv)
     assert ntv2 is ntv
 
+    # The generated subclass is shared across nominal variables of the same type
+    ntv3 = NominalVariable(1, ttype)
+    assert type(ntv3) is type(ntv)
+    assert not ntv3.equals(ntv)
+
     ntv_pkld = pickle.dumps(ntv)
     ntv_unpkld = pickle.loads(ntv_pkld)
 
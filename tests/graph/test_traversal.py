@@ -4,6 +4,7 @@ from pytensor import Variable, shared
 from pytensor import tensor as pt
 from pytensor.graph import Apply, ancestors, graph_inputs
 from pytensor.graph.traversal import (
+    ancestors_list,
     apply_ancestors,
     apply_depends_on,
     explicit_graph_inputs,
@@ -190,6 +191,9 @@ def test_ancestors():
     res_list = list(res)
     assert res_list == [o2, o1, r3]
 
+    assert ancestors_list([o2]) == [o2, o1, r2, r1, r3]
+    assert ancestors_list([o2], blockers=[o1]) == [o2, o1, r3]
+
 
 def test_graph_inputs():
     r1, r2, r3 = MyVariable(1), MyVariable(2), MyVariable(3)
@@ -263,6 +267,7 @@ def test_variable_depends_on():
     assert variable_depends_on(o, [y2, x])
     assert not variable_depends_on(y, [y2])
     assert variable_depends_on(y, [y])
+    assert not variable_depends_on(o, [])
 
 
 class TestTruncatedGraphInputs:
@@ -413,6 +418,7 @@ def test_get_var_by_name():
     [
         lambda x: all(variable_ancestors([x])),
         lambda x: all(variable_ancestors([x], blockers=[x.clone()])),
+        lambda x: all(ancestors_list([x])),
         lambda x: all(apply_ancestors([x])),
         lambda x: all(apply_ancestors([x], blockers=[x.clone()])),
         lambda x: all(toposort([x])),
@@ -425,6 +431,7 @@ def test_get_var_by_name():
     ids=[
         "variable_ancestors",
         "variable_ancestors_with_blockers",
+        "ancestors_list",
         "apply_ancestors",
         "apply_ancestors_with_blockers)",
         "toposort",
@@ -1,3 +1,4 @@
+import pickle
 from collections.abc import Callable
 from copy import deepcopy
 
@@ -173,6 +174,21 @@ class TestPerformLinker:
         fn = make_function(perform_linker(FunctionGraph(*clone([x, y, r], [e]))))
         assert fn(1.0, 2.0, 4.5) == 7.5
 
+    def test_gc(self):
+        x, y, _z = inputs()
+        a = add(x, y)
+        b = mul(a, y)
+        e = sub(b, a)
+        fn, i, o = perform_linker(FunctionGraph([x, y], [e, a])).make_thunk()
+        i[0].data, i[1].data = 1.0, 2.0
+        fn()
+        assert o[0].data == 3.0 and o[1].data == 3.0
+        assert i[0].data == 1.0 and i[1].data == 2.0
+        # Intermediate results are freed after their last use
+        storage_map = fn.storage_map
+        (b,) = (v for v in storage_map if v.owner and v.owner.op is mul)
+        assert storage_map[b][0] is None
+
 
 def wrap_linker(fgraph, linkers, wrapper):
     lnk = WrapLinker(linkers, wrapper).accept(fgraph)
@@ -234,3 +250,37 @@ def test_container_deepcopy():
         assert isinstance(d.storage[0], np.ndarray), (d.storage[0], type(d.storage[0]))
         assert d.storage[0].dtype == v.dtype, (d.storage[0].dtype, v.dtype)
         assert d.storage[0].dtype == c.type.dtype, (d.storage[0].dtype, c.type.dtype)
+        assert d.readonly == readonly
+        # Types are immutable and shared between copies
+        assert d.type is c.type
+        assert d.storage is not c.storage and d.storage[0] is not c.storage[0]
+
+
+def test_container_filter_inplace():
+    class InplaceType(Type):
+        def filter(self, data, strict=False, allow_downcast=None):
+            return np.array(data, dtype="float64")
+
+        def filter_inplace(self, value, storage, strict=False, allow_downcast=None):
+            if storage is None:
+                raise NotImplementedError()
+            storage[...] = value
+            return storage
+
+    c = Container(InplaceType(), [None])
+    c.value = [1.0, 2.0]
+    buffer = c.storage[0]
+    c.value = [3.0, 4.0]
+    # The second set reuses the array created by `filter` in the first one
+    assert c.storage[0] is buffer
+    np.testing.assert_array_equal(buffer, [3.0, 4.0])
+
+    # Types without `filter_inplace` always go through `filter`
+    c = Container(tdouble, [None])
+    c.value = 1
+    assert c.value == 1.0 and isinstance(c.value, float)
+
+    d = pickle.loads(pickle.dumps(c, protocol=0))
+    assert d.value == 1.0
+    d.value = 2
+    assert d.value == 2.0
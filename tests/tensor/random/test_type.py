@@ -87,6 +87,24 @@ class TestRandomGeneratorType:
         bitgen_h = np.random.Generator(bg_4)
         assert rng_type.values_eq(bitgen_g, bitgen_h)
 
+        assert rng_type.values_eq(bitgen_a, bitgen_a)
+        assert rng_type.values_eq(bitgen_a, bitgen_a.bit_generator.state)
+        assert rng_type.values_eq(
+            np.random.default_rng(123), np.random.default_rng(123)
+        )
+        assert not rng_type.values_eq(
+            np.random.default_rng(123), np.random.default_rng(321)
+        )
+
+        for bit_gen in ("PCG64", "Philox", "MT19937", "SFC64"):
+            bg = getattr(np.random, bit_gen)
+            rng_a = np.random.Generator(bg(123))
+            rng_b = np.random.Generator(bg(123))
+            assert rng_type.values_eq(rng_a, rng_b)
+            assert rng_type.values_eq(rng_a.bit_generator.state, rng_b)
+            rng_b.random()
+            assert not rng_type.values_eq(rng_a, rng_b)
+
         assert rng_type.is_valid_value(bitgen_a, strict=True)
         assert rng_type.is_valid_value(bitgen_b.bit_generator.state, strict=False)
         assert rng_type.is_valid_value(bitgen_c, strict=True)
@@ -414,6 +414,60 @@ class TestBatchedVectorBSolveToMatrixBSolve:
         )
 
 
+class TestBatchedMatrixBSolveToMatrixBSolve:
+    rewrite_name = "batched_matrix_b_solve_to_matrix_b_solve"
+
+    @staticmethod
+    def any_batched_solve(fn):
+        return any(
+            (
+                isinstance(node.op, Blockwise | BlockwiseWithCoreShape)
+                and isinstance(node.op.core_op, SolveBase)
+            )
+            for node in fn.maker.fgraph.apply_nodes
+        )
+
+    @pytest.mark.parametrize("solve_op", (solve, solve_triangular, cho_solve))
+    def test_valid_cases(self, solve_op):
+        rng = np.random.default_rng(sum(map(ord, solve_op.__name__)))
+
+        a = tensor(shape=(None, None))
+        b = tensor(shape=(None, None, None, None))
+
+        if solve_op is cho_solve:
+            # cho_solves expects a tuple (a, lower) as the first input
+            out = solve_op((a, True), b, b_ndim=2)
+        else:
+            out = solve_op(a, b, b_ndim=2)
+
+        mode = get_default_mode().excluding(self.rewrite_name)
+        ref_fn = pytensor.function([a, b], out, mode=mode)
+        assert self.any_batched_solve(ref_fn)
+
+        mode = get_default_mode().including(self.rewrite_name)
+        opt_fn = pytensor.function([a, b], out, mode=mode)
+        assert not self.any_batched_solve(opt_fn)
+
+        test_a = rng.normal(size=(3, 3)).astype(config.floatX)
+        test_a = test_a @ test_a.T + 3 * np.eye(3, dtype=config.floatX)
+        test_b = rng.normal(size=(2, 7, 3, 4)).astype(config.floatX)
+        np.testing.assert_allclose(
+            opt_fn(test_a, test_b),
+            ref_fn(test_a, test_b),
+            rtol=1e-7 if config.floatX == "float64" else 1e-5,
+        )
+
+    def test_invalid_batched_a(self):
+        a = tensor(shape=(None, None, None))
+        b = tensor(shape=(None, None, None))
+
+        out = solve(a, b, b_ndim=2)
+
+        mode = get_default_mode().including(self.rewrite_name)
+        opt_fn = pytensor.function([a, b], out, mode=mode)
+        assert self.any_batched_solve(opt_fn)
+
+
 @pytest.mark.parametrize(
     "constructor", [pt.dmatrix, pt.tensor3], ids=["not_batched", "batched"]
 )
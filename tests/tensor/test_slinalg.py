@@ -16,6 +16,7 @@ from pytensor.graph.basic import equal_computations
 from pytensor.link.numba import NumbaLinker
 from pytensor.tensor import TensorVariable
 from pytensor.tensor._linalg.solve.linear_control import (
+    TRSYL,
     solve_continuous_lyapunov,
     solve_discrete_are,
     solve_discrete_lyapunov,
@@ -27,6 +28,7 @@ from pytensor.tensor.slinalg import (
     Solve,
     SolveBase,
     SolveTriangular,
+    _fold_weighted_gram,
     block_diag,
     cho_solve,
     cholesky,
@@ -116,6 +118,28 @@ def test_cholesky_indef():
     assert np.all(np.isnan(chol_f(mat)))
 
 
+@pytest.mark.parametrize("lower", [True, False])
+def test_cholesky_batched(lower):
+    rng = np.random.default_rng(utt.fetch_seed())
+    r = rng.standard_normal((2, 3, 4, 4)).astype(config.floatX)
+    pd = r @ r.mT + np.eye(4, dtype=config.floatX)
+    # An indefinite matrix in the batch only affects its own output
+    pd[1, 2] = -pd[1, 2]
+
+    x = tensor("x", shape=(None, None, 4, 4))
+    chol_f = function([x], cholesky(x, lower=lower, on_error="nan"))
+    res = chol_f(pd)
+
+    assert res.dtype == config.floatX
+    assert np.all(np.isnan(res[1, 2]))
+    for idx in [(0, 0), (0, 2), (1, 0), (1, 1)]:
+        np.testing.assert_allclose(
+            res[idx],
+            scipy.linalg.cholesky(pd[idx], lower=lower),
+            rtol=1e-4 if config.floatX == "float32" else 1e-7,
+        )
+
+
 def test_cholesky_grad():
     rng = np.random.default_rng(utt.fetch_seed())
     r = rng.standard_normal((5, 5)).astype(config.floatX)
@@ -210,6 +234,24 @@ def test_eigvalsh_grad():
     )
 
 
+@pytest.mark.parametrize("lower", [True, False])
+def test_fold_weighted_gram(lower):
+    rng = np.random.default_rng(utt.fetch_seed())
+    v = rng.standard_normal((4, 4))
+    d = np.array([1.0, -2.0, 0.0, 3.0])
+
+    G = (v * d) @ v.T
+    tri = np.tril if lower else np.triu
+    expected = tri(G) + tri(G.T, -1 if lower else 1)
+    np.testing.assert_allclose(_fold_weighted_gram(v, d, lower), tri(expected))
+
+    # nan weights propagate like in the dense product
+    d[1] = np.nan
+    res = _fold_weighted_gram(v, d, lower)
+    tri_indices = np.tril_indices(4) if lower else np.triu_indices(4)
+    assert np.all(np.isnan(res[tri_indices]))
+
+
 class TestSolveBase:
     class SolveTest(SolveBase):
         def perform(self, node, inputs, outputs):
@@ -239,6 +281,22 @@ class TestSolveBase:
             b = b_func()
             self.SolveTest(b_ndim=2)(A, b)
 
+    @pytest.mark.parametrize(
+        "A_dtype, b_dtype",
+        itertools.product(
+            ["bool", "int8", "int64", "float16", "float32", "float64", "complex64"],
+            repeat=2,
+        ),
+    )
+    def test_make_node_dtype(self, A_dtype, b_dtype):
+        A = tensor(dtype=A_dtype, shape=(None, None))
+        b = tensor(dtype=b_dtype, shape=(None,))
+        y = self.SolveTest(b_ndim=1)(A, b)
+        expected_dtype = scipy.linalg.solve(
+            np.ones((1, 1), dtype=A_dtype), np.ones((1,), dtype=b_dtype)
+        ).dtype
+        assert y.type.dtype == expected_dtype
+
     def test__repr__(self):
         np.random.default_rng(utt.fetch_seed())
         A = matrix()
@@ -415,6 +473,71 @@ class TestSolve(utt.InferShapeTester):
         direct = solve_triangular(a, b, lower=False, trans=True)
         assert equal_computations([indirect], [direct])
 
+    @pytest.mark.parametrize("assume_a", ["gen", "pos"])
+    def test_solve_empty(self, assume_a):
+        rng = np.random.default_rng(utt.fetch_seed())
+        A = pt.tensor("A", shape=(5, 5))
+        b = pt.tensor("b", shape=(5, 0))
+        f = function([A, b], solve(A, b, assume_a=assume_a, b_ndim=2))
+
+        res = f(
+            rng.random((5, 5)).astype(config.floatX),
+            np.empty([5, 0], dtype=config.floatX),
+        )
+        assert res.shape == (5, 0)
+        assert res.dtype == config.floatX
+
+    @pytest.mark.parametrize("b_ndim", [1, 2])
+    def test_solve_diagonal_batched(self, b_ndim):
+        rng = np.random.default_rng(utt.fetch_seed())
+        A = pt.tensor("A", shape=(2, 3, 3))
+        b = pt.tensor("b", shape=(2, 3) if b_ndim == 1 else (2, 3, 4))
+        x = solve(A, b, assume_a="diagonal", b_ndim=b_ndim)
+
+        A_val = np.stack([np.diag(rng.uniform(1, 2, size=3)) for _ in range(2)])
+        A_val = A_val.astype(config.floatX)
+        b_val = rng.normal(size=b.type.shape).astype(config.floatX)
+        np.testing.assert_allclose(
+            x.eval({A: A_val, b: b_val}),
+            np.linalg.solve(A_val, b_val[..., None] if b_ndim == 1 else b_val).reshape(
+                b_val.shape
+            ),
+            rtol=1e-5 if config.floatX == "float32" else 1e-7,
+        )
+
+    @pytest.mark.parametrize("assume_a", ["gen", "pos"])
+    def test_solve_failure_returns_nan(self, assume_a):
+        A = pt.tensor("A", shape=(3, 3))
+        b = pt.tensor("b", shape=(3,))
+        f = function([A, b], solve(A, b, assume_a=assume_a, b_ndim=1))
+
+        # Singular for gen, and not positive definite for pos
+        A_val = np.diag([1.0, 0.0, -1.0]).astype(config.floatX)
+        res = f(A_val, np.ones(3, dtype=config.floatX))
+        assert res.shape == (3,)
+        assert np.all(np.isnan(res))
+
+    @pytest.mark.parametrize("b_ndim", [1, 2])
+    def test_solve_batched_singular(self, b_ndim):
+        rng = np.random.default_rng(utt.fetch_seed())
+        A = pt.tensor("A", shape=(3, 4, 4))
+        b = pt.tensor("b", shape=(1, 4) if b_ndim == 1 else (1, 4, 2))
+        f = function([A, b], solve(A, b, b_ndim=b_ndim))
+
+        A_val = rng.normal(size=A.type.shape).astype(config.floatX)
+        A_val[1] = 0
+        b_val = rng.normal(size=b.type.shape).astype(config.floatX)
+        res = f(A_val, b_val)
+        assert res.shape == (3, *b.type.shape[1:])
+        assert res.dtype == config.floatX
+        assert np.all(np.isnan(res[1]))
+        for i in (0, 2):
+            np.testing.assert_allclose(
+                res[i],
+                np.linalg.solve(A_val[i], b_val[0]),
+                rtol=1e-4 if config.floatX == "float32" else 1e-7,
+            )
+
 
 class TestSolveTriangular(utt.InferShapeTester):
     @staticmethod
@@ -561,6 +684,22 @@ class TestCholeskySolve(utt.InferShapeTester):
             == "CholeskySolve(lower=True,b_ndim=1,overwrite_b=False)"
         )
 
+    @pytest.mark.parametrize(
+        "A_dtype, b_dtype",
+        itertools.product(
+            ["bool", "int8", "int64", "float16", "float32", "float64", "complex64"],
+            repeat=2,
+        ),
+    )
+    def test_make_node_dtype(self, A_dtype, b_dtype):
+        A = tensor(dtype=A_dtype, shape=(None, None))
+        b = tensor(dtype=b_dtype, shape=(None,))
+        y = CholeskySolve(b_ndim=1)(A, b)
+        expected_dtype = scipy.linalg.cho_solve(
+            (np.ones((1, 1), dtype=A_dtype), True), np.ones((1,), dtype=b_dtype)
+        ).dtype
+        assert y.type.dtype == expected_dtype
+
     def test_infer_shape(self):
         rng = np.random.default_rng(utt.fetch_seed())
         A = matrix()
@@ -704,6 +843,32 @@ def test_lu_decomposition(
         np.testing.assert_allclose(a, b)
 
 
+@pytest.mark.parametrize(
+    "permute_l, p_indices",
+    [(True, False), (False, True), (False, False)],
+    ids=["PL", "p_indices", "P"],
+)
+def test_lu_decomposition_empty(permute_l, p_indices):
+    A = matrix("A")
+    pt_out = lu(A, permute_l=permute_l, p_indices=p_indices)
+    out = function([A], pt_out)(np.empty((0, 0), dtype=config.floatX))
+
+    for numerical_out, symbolic_out in zip(out, pt_out, strict=True):
+        assert numerical_out.size == 0
+        assert numerical_out.dtype == symbolic_out.type.dtype
+
+
+@pytest.mark.parametrize("shape", [(5, 3), (3, 5)], ids=["tall", "wide"])
+def test_lu_decomposition_not_square(shape):
+    with pytest.raises(ValueError, match="square"):
+        lu(tensor("A", shape=shape))
+
+    A = matrix("A")
+    f = function([A], lu(A))
+    with pytest.raises(ValueError, match="square"):
+        f(np.zeros(shape, dtype=config.floatX))
+
+
 @pytest.mark.parametrize(
     "grad_case", [0, 1, 2], ids=["dU_only", "dL_only", "dU_and_dL"]
 )
@@ -742,9 +907,11 @@ def test_pivot_to_permutation(inverse):
     if not inverse:
         perm_idx_pt = pivot_to_permutation(pivots, inverse=False).eval()
         np.testing.assert_array_equal(perm_idx_pt, perm_idx)
+        assert perm_idx_pt.dtype == "int32"
     else:
         p_inv_pt = pivot_to_permutation(pivots, inverse=True).eval()
         np.testing.assert_array_equal(p_inv_pt, np.argsort(perm_idx))
+        assert p_inv_pt.dtype == "int32"
 
 
 class TestLUSolve(utt.InferShapeTester):
@@ -819,6 +986,14 @@ class TestLUSolve(utt.InferShapeTester):
             rtol=1e-9 if config.floatX == "float64" else 1e-5,
         )
 
+    def test_lu_solve_numpy_inputs(self):
+        rng = np.random.default_rng(utt.fetch_seed())
+        A_val = rng.normal(size=(5, 5)) + np.eye(5) * 0.5
+        b_val = rng.normal(size=(5,))
+
+        x = lu_solve(scipy.linalg.lu_factor(A_val), b_val)
+        np.testing.assert_allclose(x.eval(), np.linalg.solve(A_val, b_val))
+
 
 def test_lu_factor():
     rng = np.random.default_rng(utt.fetch_seed())
@@ -981,6 +1156,21 @@ def test_solve_continuous_sylvester_grad(shape: tuple[int], use_complex):
     utt.verify_grad(solve_sylvester, pt=[A, B, Q], rng=rng)
 
 
+def test_trsyl_empty():
+    A = pt.tensor("A", shape=(0, 0))
+    B = pt.tensor("B", shape=(3, 3))
+    C = pt.tensor("C", shape=(0, 3))
+    f = function([A, B, C], TRSYL()(A, B, C))
+
+    res = f(
+        np.empty((0, 0), dtype=config.floatX),
+        np.eye(3, dtype=config.floatX),
+        np.empty((0, 3), dtype=config.floatX),
+    )
+    assert res.shape == (0, 3)
+    assert res.dtype == config.floatX
+
+
 def recover_Q(A, X, continuous=True):
     if continuous:
         return A @ X + X @ A.conj().T
@@ -1050,6 +1240,36 @@ def test_solve_discrete_lyapunov_gradient(
     )
 
 
+@pytest.mark.parametrize("rho", [0.9, 0.999], ids=["stable", "nearly_unstable"])
+@pytest.mark.parametrize("shape", [(5, 5), (5, 5, 5)], ids=["matrix", "batch"])
+def test_solve_discrete_lyapunov_smith(shape, rho):
+    rng = np.random.default_rng(utt.fetch_seed())
+    # The Smith iteration only converges for A with spectral radius below one
+    A = rng.normal(size=shape)
+    A *= rho / np.abs(np.linalg.eigvals(A)).max(axis=-1)[..., None, None]
+    Q = rng.normal(size=shape)
+    A, Q = A.astype(config.floatX), Q.astype(config.floatX)
+
+    a = pt.tensor(name="a", shape=shape)
+    q = pt.tensor(name="q", shape=shape)
+    X = function([a, q], solve_discrete_lyapunov(a, q, method="smith"))(A, Q)
+
+    atol = rtol = 1e-4 if config.floatX == "float32" else 1e-8
+    if rho > 0.99:
+        # Close to the unit circle the solution is badly conditioned
+        atol = rtol = 1e-2 if config.floatX == "float32" else 1e-6
+    np.testing.assert_allclose(
+        vec_recover_Q(A, X, continuous=False), Q, atol=atol, rtol=rtol
+    )
+
+    if config.floatX == "float64" and rho < 0.99:
+        utt.verify_grad(
+            functools.partial(solve_discrete_lyapunov, method="smith"),
+            pt=[A, Q],
+            rng=rng,
+        )
+
+
 def test_solve_continuous_lyapunov():
     # solve_continuous_lyapunov just calls solve_sylvester, so extensive tests are not needed.
     A = pt.tensor("A", shape=(3, 5, 5))
@@ -1214,6 +1434,23 @@ def test_qr_modes(mode, names, pivoting):
         np.testing.assert_allclose(out_pt, out_sp, err_msg=f"{name} disagrees")
 
 
+@pytest.mark.parametrize("mode", ["economic", "full"])
+@pytest.mark.parametrize("shape", [(4, 3), (3, 4)])
+def test_qr_batched(mode, shape):
+    rng = np.random.default_rng(utt.fetch_seed())
+    A_val = rng.random((2, 3, *shape)).astype(config.floatX)
+
+    A = tensor("A", dtype=config.floatX, shape=(None, None, None, None))
+    Q, R = function([A], qr(A, mode=mode))(A_val)
+
+    atol = 1e-5 if config.floatX == "float32" else 1e-8
+    for idx in np.ndindex(A_val.shape[:-2]):
+        Q_sp, R_sp = scipy_linalg.qr(A_val[idx], mode=mode)
+        assert Q[idx].dtype == Q_sp.dtype and R[idx].dtype == R_sp.dtype
+        np.testing.assert_allclose(Q[idx], Q_sp, atol=atol)
+        np.testing.assert_allclose(R[idx], R_sp, atol=atol)
+
+
 @pytest.mark.parametrize(
     "shape, gradient_test_case, mode",
     (
@@ -1280,6 +1517,24 @@ def test_qr_grad(shape, gradient_test_case, mode, is_complex):
         )
 
 
+@pytest.mark.parametrize("shape", [(3, 3), (6, 3), (3, 6)], ids=str)
+@pytest.mark.parametrize("mode", ["economic", "r"])
+def test_qr_grad_unknown_shape(shape, mode):
+    rng = np.random.default_rng(utt.fetch_seed())
+    a = rng.standard_normal(shape).astype(config.floatX)
+
+    def _grad_fn(x):
+        outs = qr(x, mode=mode)
+        cost = outs.sum() if mode == "r" else outs[0].sum() + outs[1].sum()
+        return function([x], grad(cost, x))
+
+    static_grad = _grad_fn(tensor("x", shape=shape))(a)
+    unknown_grad = _grad_fn(tensor("x", shape=(None, None)))(a)
+    np.testing.assert_allclose(
+        unknown_grad, static_grad, rtol=1e-4 if config.floatX == "float32" else 1e-7
+    )
+
+
 class TestSchur:
     @pytest.mark.parametrize(
         "shape, output",
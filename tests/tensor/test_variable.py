@@ -358,6 +358,13 @@ class TestTensorConstantSignature:
         assert f(0) == 0
         assert f(np.nan) == 0
 
+    def test_shared_data(self):
+        data = np.array([np.nan, 1.0, 2.0])
+        x = constant(data)
+        assert x.signature() == x.clone().signature()
+        assert x.signature() == constant(data.copy()).signature()
+        assert x.signature() != constant(data[::-1].copy()).signature()
+
     def test_empty_hash(self):
         x = constant(np.array([], dtype=np.int64))
         y = constant(np.array([], dtype=np.int64))